@@ -0,0 +1,273 @@
+"""
+Lockstep battle engine for running many independent battles at once.
+
+Every monster taking part in the batch is packed into flat NumPy arrays
+(attack, defense, speed, hp, element index). Each team is a row of monster
+indices in team order, padded with -1. All battles then advance one turn at
+a time with masked array operations, following `Battle.process_turn` exactly.
+
+Usage:
+```
+results = BatchBattle().battle([(team1, team2), (team3, team4)])
+results[0]  # Battle.Result.TEAM1 / TEAM2 / DRAW
+```
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from battle import Battle
+from elements import EffectivenessCalculator
+from team import MonsterTeam
+
+_FRONT, _BACK, _OPTIMISE = 0, 1, 2
+_NO_MONSTER = -1
+
+
+class _TeamRows:
+    """
+    The team lists of one side (team 1 or team 2) of every battle in the batch.
+
+    Attributes:
+        order (np.ndarray): (battles, width) monster indices in team order, padded with -1.
+            The last column is always padding, so rows can be shifted without overflow.
+        count (np.ndarray): number of monsters in each team list.
+        mode (np.ndarray): team mode code of each team.
+        descending (np.ndarray): sort direction of each OPTIMISE team.
+        hp_key (np.ndarray): whether each OPTIMISE team sorts by (changing) HP.
+    """
+
+    def __init__(self, n_battles: int, width: int) -> None:
+        self.order = np.full((n_battles, width + 1), _NO_MONSTER, dtype=np.int64)
+        self.count = np.zeros(n_battles, dtype=np.int64)
+        self.mode = np.zeros(n_battles, dtype=np.int8)
+        self.descending = np.ones(n_battles, dtype=bool)
+        self.hp_key = np.zeros(n_battles, dtype=bool)
+
+    def add(self, rows: np.ndarray, members: np.ndarray, hp: np.ndarray, sort_value: np.ndarray) -> None:
+        """
+        Vectorised `MonsterTeam.add_to_team` for one monster per row.
+        :complexity: O(r*w log w) where r is len(rows) and w the team width.
+        """
+        if len(rows) == 0:
+            return
+        mode = self.mode[rows]
+        back = mode == _BACK
+        back_rows = rows[back]
+        self.order[back_rows, self.count[back_rows]] = members[back]
+        # FRONT and OPTIMISE both insert at index 0.
+        front_rows = rows[~back]
+        self.order[front_rows, 1:] = self.order[front_rows, :-1]
+        self.order[front_rows, 0] = members[~back]
+        self.count[rows] += 1
+        self._sort(rows[mode == _OPTIMISE], hp, sort_value)
+
+    def _sort(self, rows: np.ndarray, hp: np.ndarray, sort_value: np.ndarray) -> None:
+        """
+        Stable sort of each row by its team's sort key. The new monster was inserted at
+        index 0, so it goes ahead of its ties, as in the OPTIMISE team heap.
+        """
+        if len(rows) == 0:
+            return
+        order = self.order[rows]
+        valid = order != _NO_MONSTER
+        safe = np.where(valid, order, 0)
+        key = np.where(self.hp_key[rows][:, None], hp[safe], sort_value[safe])
+        key = np.where(self.descending[rows][:, None], -key, key)
+        key[~valid] = np.inf
+        perm = np.argsort(key, axis=1, kind="stable")
+        self.order[rows] = np.take_along_axis(order, perm, axis=1)
+
+    def retrieve(self, rows: np.ndarray, hp: np.ndarray) -> np.ndarray:
+        """
+        Vectorised `MonsterTeam.retrieve_from_team`: removes and returns the first living
+        monster of each row, or -1 for rows with no living monster.
+        :complexity: O(r*w) where r is len(rows) and w the team width.
+        """
+        order = self.order[rows]
+        valid = order != _NO_MONSTER
+        alive = valid & (hp[np.where(valid, order, 0)] > 0)
+        found = alive.any(axis=1)
+        first = alive.argmax(axis=1)
+        members = np.where(found, order[np.arange(len(rows)), first], _NO_MONSTER)
+
+        cols = np.arange(order.shape[1])
+        source = np.minimum(cols[None, :] + (cols[None, :] >= first[:, None]), order.shape[1] - 1)
+        shifted = np.take_along_axis(order, source, axis=1)
+        self.order[rows] = np.where(found[:, None], shifted, order)
+        self.count[rows] -= found
+        return members
+
+
+class BatchBattle:
+    """
+    Runs many battles in lockstep, with the same outcome as calling
+    `Battle.battle` on each pair of teams.
+
+    Differences from `Battle`:
+    * The teams passed in are read, never modified.
+    * Teams must use the default `MonsterTeam.choose_action`,
+      and no monster may be ready to evolve (battles never level monsters up).
+
+    Attributes:
+        turn_counts (np.ndarray): number of turns each battle of the last batch took.
+    """
+
+    def __init__(self) -> None:
+        self.turn_counts = None
+
+    def battle(self, team_pairs) -> np.ndarray:
+        """
+        Battles every (team1, team2) pair in `team_pairs`.
+
+        :returns: an object array holding the `Battle.Result` of each battle, in order.
+        :raises ValueError: if a team has no living monster or a monster is ready to evolve.
+        :complexity: O(t*n*w log w) where t is the longest battle in turns,
+            n the number of battles and w the largest team size.
+        """
+        n = len(team_pairs)
+        self._pack(team_pairs)
+        sides = self.sides
+        hp = self.hp
+
+        out1 = sides[0].retrieve(np.arange(n), hp)
+        out2 = sides[1].retrieve(np.arange(n), hp)
+        if (out1 == _NO_MONSTER).any() or (out2 == _NO_MONSTER).any():
+            raise ValueError("Every team needs at least one living monster to battle")
+
+        self.turn_counts = np.zeros(n, dtype=np.int64)
+        results = np.empty(n, dtype=object)
+        rows = np.arange(n)
+        while len(rows):
+            o1, o2 = self._process_turn(rows, out1[rows], out2[rows])
+            out1[rows] = o1
+            out2[rows] = o2
+            self.turn_counts[rows] += 1
+
+            lost1 = o1 == _NO_MONSTER
+            lost2 = o2 == _NO_MONSTER
+            results[rows[lost1 & lost2]] = Battle.Result.DRAW
+            results[rows[lost1 & ~lost2]] = Battle.Result.TEAM2
+            results[rows[~lost1 & lost2]] = Battle.Result.TEAM1
+            rows = rows[~(lost1 | lost2)]
+        return results
+
+    def _process_turn(self, rows: np.ndarray, o1: np.ndarray, o2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """One turn of `Battle.process_turn` for every battle in `rows`."""
+        speed, hp = self.speed, self.hp
+        team1, team2 = self.sides
+
+        # Actions, as chosen by MonsterTeam.choose_action. SPECIAL is never chosen.
+        attack1 = (speed[o1] >= speed[o2]) | (hp[o1] >= hp[o2])
+        attack2 = (speed[o2] >= speed[o1]) | (hp[o2] >= hp[o1])
+
+        # Swaps: the current monster goes back and the first living one comes out.
+        swap1 = ~attack1
+        if swap1.any():
+            team1.add(rows[swap1], o1[swap1], hp, self.sort_value)
+            o1[swap1] = team1.retrieve(rows[swap1], hp)
+        swap2 = ~attack2
+        if swap2.any():
+            team2.add(rows[swap2], o2[swap2], hp, self.sort_value)
+            o2[swap2] = team2.retrieve(rows[swap2], hp)
+
+        # Attacks. On a speed tie both monsters attack twice (1, 2 then 2, 1),
+        # as process_turn falls through into its else branch.
+        both = attack1 & attack2
+        tied = both & (speed[o1] == speed[o2])
+        self._attack(o1, o2, tied)
+        self._attack(o2, o1, tied)
+        one_first = np.where(both, speed[o1] > speed[o2], attack1)
+        self._attack(o1, o2, one_first)
+        self._attack(o2, o1, ~one_first)
+        self._attack(o1, o2, both & ~one_first)
+        self._attack(o2, o1, both & one_first)
+
+        # Both survive: both lose 1 HP.
+        alive = (hp[o1] > 0) & (hp[o2] > 0)
+        hp[o1[alive]] -= 1
+        hp[o2[alive]] -= 1
+
+        # Fainted monsters go back and are replaced by the next living one, if any.
+        fainted1 = hp[o1] <= 0
+        if fainted1.any():
+            team1.add(rows[fainted1], o1[fainted1], hp, self.sort_value)
+            o1[fainted1] = team1.retrieve(rows[fainted1], hp)
+        fainted2 = hp[o2] <= 0
+        if fainted2.any():
+            team2.add(rows[fainted2], o2[fainted2], hp, self.sort_value)
+            o2[fainted2] = team2.retrieve(rows[fainted2], hp)
+        return o1, o2
+
+    def _attack(self, attackers: np.ndarray, defenders: np.ndarray, mask: np.ndarray) -> None:
+        """Vectorised `MonsterBase.attack` for the masked battles. Dead attackers do nothing."""
+        mask = mask & (self.hp[attackers] > 0)
+        attackers = attackers[mask]
+        defenders = defenders[mask]
+        if len(attackers) == 0:
+            return
+        attack = self.attack[attackers]
+        defense = self.defense[defenders]
+        damage = np.where(
+            defense < attack/2,
+            attack - defense,
+            np.where(defense < attack, attack * 5/8 - defense/4, attack / 4),
+        )
+        multiplier = self.effectiveness[self.element[attackers], self.element[defenders]]
+        # Each battle owns its monsters, so defenders never repeat within one call.
+        self.hp[defenders] -= np.trunc(damage * multiplier) + 1
+
+    def _pack(self, team_pairs) -> None:
+        """Packs every monster of every team into flat arrays, and the team lists into _TeamRows."""
+        n = len(team_pairs)
+        width = 1
+        n_monsters = 0
+        for team1, team2 in team_pairs:
+            width = max(width, len(team1.team), len(team2.team))
+            n_monsters += len(team1.team) + len(team2.team)
+
+        self.attack = np.empty(n_monsters, dtype=np.float64)
+        self.defense = np.empty(n_monsters, dtype=np.float64)
+        self.speed = np.empty(n_monsters, dtype=np.float64)
+        self.hp = np.empty(n_monsters, dtype=np.float64)
+        self.element = np.empty(n_monsters, dtype=np.int64)
+        self.sort_value = np.zeros(n_monsters, dtype=np.float64)
+        self.sides = (_TeamRows(n, width), _TeamRows(n, width))
+
+        size, positions, matrix = EffectivenessCalculator.get_table()
+        self.effectiveness = np.array(matrix, dtype=np.float64).reshape(size, size)
+
+        idx = 0
+        for b, pair in enumerate(team_pairs):
+            for side, team in zip(self.sides, pair):
+                side.mode[b] = self._mode_code(team)
+                side.descending[b] = team.descending
+                side.hp_key[b] = team.sort_key is MonsterTeam.SortMode.HP
+                # OPTIMISE teams are heaps; pack them in priority order.
+                monsters = team.team.export() if side.mode[b] == _OPTIMISE else team.team
+                for i in range(len(monsters)):
+                    monster = monsters[i]
+                    if monster.ready_to_evolve():
+                        raise ValueError(f"{monster} is ready to evolve, which batch battles do not model")
+                    self.attack[idx] = monster.get_attack()
+                    self.defense[idx] = monster.get_defense()
+                    self.speed[idx] = monster.get_speed()
+                    self.hp[idx] = monster.get_hp()
+                    self.element[idx] = positions[monster.get_element_type().value]
+                    if side.mode[b] == _OPTIMISE and not side.hp_key[b]:
+                        self.sort_value[idx] = team.sort_key(monster)
+                    side.order[b, i] = idx
+                    idx += 1
+                side.count[b] = len(monsters)
+
+    @staticmethod
+    def _mode_code(team: MonsterTeam) -> int:
+        if team.team_mode == MonsterTeam.TeamMode.FRONT:
+            return _FRONT
+        if team.team_mode == MonsterTeam.TeamMode.BACK:
+            return _BACK
+        if team.team_mode == MonsterTeam.TeamMode.OPTIMISE:
+            if team.sort_key is None:
+                raise ValueError("Sort stat must be provided for Optimize team mode")
+            return _OPTIMISE
+        raise ValueError(f"team_mode {team.team_mode} not supported.")
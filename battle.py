@@ -1,11 +1,83 @@
 from __future__ import annotations
 from enum import auto
+from time import perf_counter
 from typing import Optional
 
 from base_enum import BaseEnum
 from team import MonsterTeam
 
 
+class BattleStats:
+    """
+    Counters and timings collected by a Battle made with profile=True.
+
+    Attributes:
+        phase_seconds (dict[str, float]): time spent in each phase of process_turn, by PHASES name
+        actions (dict[str, int]): number of times each Battle.Action was chosen, by name
+        attack_calls (int): calls made to a monster's attack
+        battles (int): battles fought to the end
+        turns (int): turns processed in those battles
+        max_turns (int): turns taken by the longest battle
+    """
+
+    SELECT = "select"
+    SPECIAL_SWAP = "special_swap"
+    ATTACK = "attack"
+    EVOLVE = "evolve"
+    FAINT = "faint"
+    PHASES = (SELECT, SPECIAL_SWAP, ATTACK, EVOLVE, FAINT)
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Sets every counter and timing back to zero."""
+        self.phase_seconds = {phase: 0.0 for phase in self.PHASES}
+        self.actions = {action.name: 0 for action in Battle.Action}
+        self.attack_calls = 0
+        self.battles = 0
+        self.turns = 0
+        self.max_turns = 0
+
+    def lap(self, phase: str, start: float) -> float:
+        """Adds the time since `start` to a phase and returns the current time, to start the next one."""
+        now = perf_counter()
+        self.phase_seconds[phase] += now - start
+        return now
+
+    def add_battle(self, turns: int) -> None:
+        self.battles += 1
+        self.turns += turns
+        if turns > self.max_turns:
+            self.max_turns = turns
+
+    def mean_turns(self) -> float:
+        return self.turns / self.battles if self.battles else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "battles": self.battles,
+            "turns": self.turns,
+            "mean_turns": self.mean_turns(),
+            "max_turns": self.max_turns,
+            "attack_calls": self.attack_calls,
+            "actions": dict(self.actions),
+            "phase_seconds": dict(self.phase_seconds),
+        }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        import json # Imported here so `import battle` stays cheap; see benchmarks/bench_import_battle.py
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def dump(self, path: str) -> None:
+        """Writes the stats to a file as JSON."""
+        with open(path, "w") as f:
+            f.write(self.to_json(indent=2))
+
+    def __str__(self) -> str:
+        return self.to_json()
+
+
 class Battle:
 
     class Action(BaseEnum):
@@ -18,8 +90,15 @@ class Battle:
         TEAM2 = auto()
         DRAW = auto()
 
-    def __init__(self, verbosity=0) -> None:
+    def __init__(self, verbosity=0, profile: bool = False, log=None) -> None:
+        """
+        :param profile: collect a BattleStats in `stats` for every turn and battle.
+            When False (the default) `stats` is None and each turn only checks it.
+        :param log: a battle_log.BattleLogWriter to record every turn and battle to, or None.
+        """
         self.verbosity = verbosity
+        self.stats = BattleStats() if profile else None
+        self.log = log
 
 
     def process_turn(self) -> Optional[Battle.Result]:
@@ -32,9 +111,17 @@ class Battle:
 
         
         """
+        stats = self.stats
+        log = self.log
+        if stats is not None:
+            lap = perf_counter()
         #Get action from each team
         t1_action = self.team1.choose_action(self.out1, self.out2)
         t2_action = self.team2.choose_action(self.out2, self.out1)
+        if stats is not None:
+            lap = stats.lap(BattleStats.SELECT, lap)
+            stats.actions[t1_action.name] += 1
+            stats.actions[t2_action.name] += 1
         
         #execute special move or swap for team 1
         if t1_action == Battle.Action.SPECIAL:
@@ -48,32 +135,53 @@ class Battle:
         elif t2_action == Battle.Action.SWAP:
             self.team2.add_to_team(self.out2)
             self.out2 = self.team2.retrieve_from_team()
+        if stats is not None:
+            lap = stats.lap(BattleStats.SPECIAL_SWAP, lap)
+        if log is not None:
+            log.before_attacks(self.out1, self.out2)
         #Deals with if both teams attack
         if t1_action == Battle.Action.ATTACK and t2_action == Battle.Action.ATTACK:
             if self.out1.get_speed() == self.out2.get_speed():
                 self.out1.attack(self.out2)
                 self.out2.attack(self.out1)
+                if stats is not None:
+                    stats.attack_calls += 2
             if self.out1.get_speed() > self.out2.get_speed():
                 self.out1.attack(self.out2)
                 self.out2.attack(self.out1)
             else:
                 self.out2.attack(self.out1)
                 self.out1.attack(self.out2)
+            if stats is not None:
+                stats.attack_calls += 2
         #if only one team attacks
         elif t1_action == Battle.Action.ATTACK:
             self.out1.attack(self.out2)
-        else: self.out2.attack(self.out1)
+            if stats is not None:
+                stats.attack_calls += 1
+        else:
+            self.out2.attack(self.out1)
+            if stats is not None:
+                stats.attack_calls += 1
+        if log is not None:
+            log.after_attacks(self.out1, self.out2)
         
         #if both are alive after the attacks, 1 health point is subtracted from both
         if self.out1.alive() and self.out2.alive():
             self.out1.remove_health(1)
             self.out2.remove_health(1)
+        if stats is not None:
+            lap = stats.lap(BattleStats.ATTACK, lap)
 
         #evolves pokemon if alive
         if self.out1.ready_to_evolve():
             self.out1=self.out1.evolve()
         if self.out2.ready_to_evolve():
             self.out2=self.out2.evolve()
+        if stats is not None:
+            lap = stats.lap(BattleStats.EVOLVE, lap)
+        if log is not None:
+            log.end_turn(t1_action, t2_action, self.out1, self.out2)
         #if either are dead, returns next alive monster from team queue
         #returns None if no monsters in team queue are alive
         if not self.out1.alive():
@@ -82,6 +190,8 @@ class Battle:
         if not self.out2.alive():
             self.team2.add_to_team(self.out2)
             self.out2 = self.team2.retrieve_from_team()
+        if stats is not None:
+            stats.lap(BattleStats.FAINT, lap)
 
         #give final return based on value of out1 and out2
         if self.out1 == None or self.out2 == None:
@@ -107,9 +217,16 @@ class Battle:
         self.out1 = self.team1.retrieve_from_team()
         self.out2 = self.team2.retrieve_from_team()
         result = None
+        if self.log is not None:
+            self.log.start_battle()
         #main game loop
         while result == None:
             result = self.process_turn()
+            self.turn_number += 1
+        if self.stats is not None:
+            self.stats.add_battle(self.turn_number)
+        if self.log is not None:
+            self.log.end_battle(result)
         #put monsters back on team at end of battle
         if self.out1 != None:
             self.team1.add_to_team(self.out1)
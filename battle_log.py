@@ -0,0 +1,344 @@
+"""
+Compact binary log of battles, for replaying or querying them without re-simulating.
+
+A log file is a header followed by battles, each a battle header and one
+fixed-size record per turn. Records are struct-packed, little-endian:
+
+    file header    magic b"BTLG", format version (B), number of monster classes (H)
+    battle header  number of turns (I), Battle.Result value (B)
+    turn record    actions (B), class ids (B, B), slots (B, B), levels (I, I), damage dealt (f, f), hp (f, f)
+
+Monsters are identified by their index in helpers.get_all_monsters(), so a log
+can only be read with the catalog it was written with. Monsters of other classes
+(such as subclasses made for tests) are logged as their nearest catalog ancestor,
+or as UNKNOWN_CLASS if they have none. So that monsters of the same class can be
+told apart, each is also given a slot on its team for the battle: 0 for the
+first monster of the team to fight, 1 for the next one that had not fought yet,
+and so on. A monster keeps its slot when it is swapped out and back in, and
+when it evolves.
+
+Each turn records the monsters that fought (after any swap), the damage each
+dealt with its attacks and, at the end of the turn, their level and hp (after
+the 1 HP tick and evolution, before fainted monsters are replaced). Damage and
+hp are 32-bit floats, so any value can be logged; whole numbers are exact up
+to 2**24 in size and rounded beyond. The actions byte holds each team's
+Battle.Action value in two bits, and one bit per team for evolution.
+
+Usage:
+```
+with BattleLogWriter("tower.blog") as log:
+    Battle(log=log).battle(team1, team2)
+
+reader = BattleLogReader("tower.blog")
+reader.results()                 # Battle.Result of every battle
+for line in reader.replay(0):    # one line per turn
+    print(line)
+```
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from typing import NamedTuple, Optional
+
+from battle import Battle
+from helpers import get_all_monsters
+from monster_base import MonsterBase
+
+MAGIC = b"BTLG"
+LOG_VERSION = 3
+# Class id logged for monsters whose class is not in the catalog.
+UNKNOWN_CLASS = 255
+
+_FILE_HEADER = struct.Struct("<4sBH")
+_BATTLE_HEADER = struct.Struct("<IB")
+_TURN = struct.Struct("<BBBBBIIffff")
+
+_EVOLVED1 = 1 << 4
+_EVOLVED2 = 1 << 5
+
+
+def _check_header(data, path: str, n_classes: int) -> None:
+    """:raises ValueError: unless data starts with a log header for n_classes monster classes."""
+    if len(data) < _FILE_HEADER.size:
+        raise ValueError(f"{path} is not a version {LOG_VERSION} battle log")
+    magic, version, classes = _FILE_HEADER.unpack_from(data)
+    if magic != MAGIC or version != LOG_VERSION:
+        raise ValueError(f"{path} is not a version {LOG_VERSION} battle log")
+    if classes != n_classes:
+        raise ValueError(f"{path} was written for {classes} monster classes, the catalog has {n_classes}")
+
+
+class BattleLogWriter:
+    """
+    Appends battles to a log file. Pass one to Battle(log=...), which calls
+    start_battle, the per-turn hooks and end_battle.
+
+    A battle's turns are kept in memory until it ends and are then written in one go.
+    Writes are buffered, so a crash can still leave a partly written battle at the end
+    of the file; BattleLogReader skips it.
+    """
+
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens `path` for appending, writing the file header if it is new or empty.
+        :raises ValueError: if the file is a log of another format or catalog,
+            or the catalog has too many classes to log.
+        """
+        self.path = path
+        monsters = get_all_monsters()
+        if len(monsters) >= UNKNOWN_CLASS:
+            raise ValueError(f"Battle logs hold up to {UNKNOWN_CLASS} monster classes, the catalog has {len(monsters)}")
+        self._class_ids = {}
+        for i in range(len(monsters)):
+            self._class_ids[monsters[i]] = i
+        self.battles = 0
+        self._file = open(path, "ab", buffering=self.BUFFER_SIZE)
+        try:
+            if self._file.tell() == 0:
+                self._file.write(_FILE_HEADER.pack(MAGIC, LOG_VERSION, len(monsters)))
+            else:
+                with open(path, "rb") as f:
+                    _check_header(f.read(_FILE_HEADER.size), path, len(monsters))
+        except BaseException:
+            self._file.close()
+            raise
+        self._turns = bytearray()
+        self._turn_count = 0
+        # Per team, the slot of each monster that has fought this battle, by id(),
+        # and the number of slots given out.
+        self._slots = ({}, {})
+        self._slot_counts = [0, 0]
+        # The monsters in _slots, kept so their ids are not reused during the battle.
+        self._fought = []
+
+    def _class_id(self, monster) -> int:
+        class_id = self._class_ids.get(type(monster))
+        if class_id is not None:
+            return class_id
+        # Roster views (see roster.py) share one type, so ask for their class.
+        monster_class = getattr(monster, "monster_class", None)
+        if monster_class is not None:
+            return self._class_ids.get(monster_class(), UNKNOWN_CLASS)
+        class_id = UNKNOWN_CLASS
+        for base in type(monster).__mro__:
+            if base in self._class_ids:
+                class_id = self._class_ids[base]
+                break
+        self._class_ids[type(monster)] = class_id
+        return class_id
+
+    def _slot(self, team: int, monster: MonsterBase) -> int:
+        slots = self._slots[team]
+        slot = slots.get(id(monster))
+        if slot is None:
+            slot = slots[id(monster)] = self._slot_counts[team]
+            self._slot_counts[team] += 1
+            self._fought.append(monster)
+        return slot
+
+    def start_battle(self) -> None:
+        self._turns.clear()
+        self._turn_count = 0
+        for slots in self._slots:
+            slots.clear()
+        self._slot_counts = [0, 0]
+        self._fought.clear()
+
+    def before_attacks(self, out1: MonsterBase, out2: MonsterBase) -> None:
+        """Notes the monsters about to fight and their hp."""
+        self._out1 = out1
+        self._out2 = out2
+        self._fighter1 = self._class_id(out1)
+        self._fighter2 = self._class_id(out2)
+        self._slot1 = self._slot(0, out1)
+        self._slot2 = self._slot(1, out2)
+        self._hp1 = out1.get_hp()
+        self._hp2 = out2.get_hp()
+
+    def after_attacks(self, out1: MonsterBase, out2: MonsterBase) -> None:
+        """Notes the damage dealt by the attacks, before the 1 HP tick."""
+        self._damage1 = self._hp2 - out2.get_hp()
+        self._damage2 = self._hp1 - out1.get_hp()
+
+    def end_turn(self, t1_action: Battle.Action, t2_action: Battle.Action, out1: MonsterBase, out2: MonsterBase) -> None:
+        """
+        Records the turn, given the monsters out after evolution.
+        :complexity: O(1)
+        """
+        flags = t1_action.value | (t2_action.value << 2)
+        if self._class_id(out1) != self._fighter1:
+            flags |= _EVOLVED1
+        if self._class_id(out2) != self._fighter2:
+            flags |= _EVOLVED2
+        # A monster that evolved into a new instance keeps the slot it fought in.
+        if out1 is not self._out1:
+            self._slots[0][id(out1)] = self._slot1
+            self._fought.append(out1)
+        if out2 is not self._out2:
+            self._slots[1][id(out2)] = self._slot2
+            self._fought.append(out2)
+        self._turns += _TURN.pack(
+            flags, self._fighter1, self._fighter2, self._slot1, self._slot2, out1.get_level(), out2.get_level(),
+            self._damage1, self._damage2, out1.get_hp(), out2.get_hp(),
+        )
+        self._turn_count += 1
+
+    def end_battle(self, result: Battle.Result) -> None:
+        self._file.write(_BATTLE_HEADER.pack(self._turn_count, result.value))
+        self._file.write(self._turns)
+        self.battles += 1
+        self._fought.clear()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> BattleLogWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TurnRecord(NamedTuple):
+    """
+    One turn of a logged battle. `damage1` is dealt by monster1 to monster2, and vice versa.
+    A monster is None if it was logged as UNKNOWN_CLASS. `slot1` and `slot2` tell the
+    monsters of a team apart within the battle (see the module docstring).
+    """
+    action1: Battle.Action
+    action2: Battle.Action
+    monster1: Optional[type[MonsterBase]]
+    monster2: Optional[type[MonsterBase]]
+    slot1: int
+    slot2: int
+    level1: int
+    level2: int
+    damage1: float
+    damage2: float
+    hp1: float
+    hp2: float
+    evolved1: bool
+    evolved2: bool
+
+
+class BattleReplay(NamedTuple):
+    result: Battle.Result
+    turns: list[TurnRecord]
+
+
+class BattleLogReader:
+    """
+    Random access to the battles of a log file. The file is memory-mapped and
+    indexed once on opening; battles are decoded only when asked for.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :raises ValueError: if the file is not a log for the current catalog.
+        :complexity: O(b) where b is the number of battles in the log
+        """
+        self.path = path
+        self.monsters = get_all_monsters()
+        monsters = [self.monsters[i] for i in range(len(self.monsters))]
+        self._classes = {i: monsters[i] for i in range(len(monsters))}
+        self._classes[UNKNOWN_CLASS] = None
+        self._actions = {action.value: action for action in Battle.Action}
+        self._results = {result.value: result for result in Battle.Result}
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _FILE_HEADER.size:
+                raise ValueError(f"{path} is not a version {LOG_VERSION} battle log")
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            _check_header(self._data, path, len(self.monsters))
+        except BaseException:
+            self._data.close()
+            raise
+
+        # Offset of each battle's header. A battle cut short by a crash is ignored.
+        self._offsets = array("Q")
+        offset = _FILE_HEADER.size
+        while offset + _BATTLE_HEADER.size <= size:
+            turns, _ = _BATTLE_HEADER.unpack_from(self._data, offset)
+            end = offset + _BATTLE_HEADER.size + turns * _TURN.size
+            if end > size:
+                break
+            self._offsets.append(offset)
+            offset = end
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _header(self, index: int) -> tuple[int, int]:
+        return _BATTLE_HEADER.unpack_from(self._data, self._offsets[index])
+
+    def result(self, index: int) -> Battle.Result:
+        """:complexity: O(1)"""
+        return self._results[self._header(index)[1]]
+
+    def turn_count(self, index: int) -> int:
+        """:complexity: O(1)"""
+        return self._header(index)[0]
+
+    def results(self) -> list[Battle.Result]:
+        """Returns the result of every battle, reading only battle headers."""
+        return [self.result(i) for i in range(len(self))]
+
+    def __getitem__(self, index: int) -> BattleReplay:
+        """
+        Decodes one battle.
+        :raises IndexError: if there is no battle at index.
+        :complexity: O(t) where t is the number of turns in the battle
+        """
+        offset = self._offsets[index]
+        turns, result = _BATTLE_HEADER.unpack_from(self._data, offset)
+        start = offset + _BATTLE_HEADER.size
+        records = []
+        for flags, id1, id2, slot1, slot2, level1, level2, damage1, damage2, hp1, hp2 in _TURN.iter_unpack(
+            self._data[start:start + turns * _TURN.size]
+        ):
+            records.append(TurnRecord(
+                self._actions[flags & 3], self._actions[(flags >> 2) & 3],
+                self._classes[id1], self._classes[id2], slot1, slot2, level1, level2,
+                damage1, damage2, hp1, hp2, bool(flags & _EVOLVED1), bool(flags & _EVOLVED2),
+            ))
+        return BattleReplay(self._results[result], records)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def replay(self, index: int):
+        """Yields a line of text describing each turn of a battle, then its result."""
+        battle = self[index]
+        for number, turn in enumerate(battle.turns, 1):
+            sides = []
+            for action, monster, slot, level, damage, hp, evolved in (
+                (turn.action1, turn.monster1, turn.slot1, turn.level1, turn.damage1, turn.hp1, turn.evolved1),
+                (turn.action2, turn.monster2, turn.slot2, turn.level2, turn.damage2, turn.hp2, turn.evolved2),
+            ):
+                name = "Unknown" if monster is None else monster.get_name()
+                side = f"#{slot} {name} {action.name} ({damage:g} damage)"
+                if evolved and monster is not None:
+                    side += f", evolved into {monster.get_evolution().get_name()}"
+                side += f", LV.{level} {hp:g} HP" + (", fainted" if hp <= 0 else "")
+                sides.append(side)
+            yield f"Turn {number}: {sides[0]} | {sides[1]}"
+        yield f"Result: {battle.result.name}"
+
+    def close(self) -> None:
+        self._data.close()
+
+    def __enter__(self) -> BattleLogReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,6 @@
+"""
+Micro-benchmarks for the hot paths of the battle simulation.
+
+Run from the repository root, e.g. `python -m benchmarks.bench_effectiveness`,
+since the monster and effectiveness data files are loaded relative to it.
+"""
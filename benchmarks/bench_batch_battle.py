@@ -0,0 +1,43 @@
+"""
+Throughput of BatchBattle against running Battle.battle on each pair in turn.
+
+Usage: python -m benchmarks.bench_batch_battle [battles]
+"""
+import sys
+import time
+
+from battle import Battle
+from batch_battle import BatchBattle
+from random_gen import RandomGen
+from team import MonsterTeam
+
+
+def run(n: int) -> None:
+    RandomGen.set_seed(123456789)
+    pairs = [
+        (
+            MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM),
+            MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM),
+        )
+        for _ in range(n)
+    ]
+
+    # BatchBattle leaves the teams untouched, so it must go first.
+    start = time.perf_counter()
+    batch_results = BatchBattle().battle(pairs)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    battle = Battle(verbosity=0)
+    scalar_results = [battle.battle(team1, team2) for team1, team2 in pairs]
+    scalar_time = time.perf_counter() - start
+
+    assert list(batch_results) == scalar_results
+    print(f"{n} battles")
+    print(f"Battle.battle: {n / scalar_time:12.0f} battles/s")
+    print(f"BatchBattle:   {n / batch_time:12.0f} battles/s")
+    print(f"speedup: {scalar_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,50 @@
+"""
+Cost of logging battles with BattleLogWriter: battles/s without and with a log,
+bytes per battle, and how fast BattleLogReader indexes and decodes the log.
+
+Usage: python -m benchmarks.bench_battle_log [battles]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from battle import Battle
+from battle_log import BattleLogReader, BattleLogWriter
+from benchmarks.bench_battle_profile import time_battles
+
+
+def run(n: int) -> None:
+    time_battles(Battle(verbosity=0), min(n, 1000))  # warm up caches
+    plain_time, plain_results = time_battles(Battle(verbosity=0), n)
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "battles.blog")
+    try:
+        with BattleLogWriter(path) as log:
+            # Includes flushing the last of the log when it is closed.
+            logged_time, logged_results = time_battles(Battle(verbosity=0, log=log), n)
+        assert plain_results == logged_results
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        reader = BattleLogReader(path)
+        index_time = time.perf_counter() - start
+        assert reader.results() == plain_results
+        start = time.perf_counter()
+        turns = sum(len(battle.turns) for battle in reader)
+        decode_time = time.perf_counter() - start
+        reader.close()
+    finally:
+        os.remove(path)
+        os.rmdir(directory)
+
+    print(f"{n} battles, {turns} turns")
+    print(f"no log:  {n / plain_time:10.0f} battles/s")
+    print(f"logged:  {n / logged_time:10.0f} battles/s ({logged_time / plain_time - 1:+.0%} time)")
+    print(f"log size: {size} bytes, {size / n:.1f} bytes/battle")
+    print(f"reader: indexed in {index_time * 1e3:.1f} ms, decoded {n / decode_time:.0f} battles/s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,47 @@
+"""
+Cost of Battle's profiling: battles/s with profile off and on, then the stats collected.
+
+Usage: python -m benchmarks.bench_battle_profile [battles]
+"""
+import sys
+import time
+
+from battle import Battle
+from random_gen import RandomGen
+from team import MonsterTeam
+
+
+def make_pairs(n: int) -> list:
+    RandomGen.set_seed(123456789)
+    return [
+        (
+            MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM),
+            MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM),
+        )
+        for _ in range(n)
+    ]
+
+
+def time_battles(battle: Battle, n: int) -> tuple[float, list]:
+    # Battles change the teams, so each run gets the same fresh ones.
+    pairs = make_pairs(n)
+    start = time.perf_counter()
+    results = [battle.battle(team1, team2) for team1, team2 in pairs]
+    return time.perf_counter() - start, results
+
+
+def run(n: int) -> None:
+    time_battles(Battle(verbosity=0), min(n, 1000))  # warm up caches
+    plain_time, plain_results = time_battles(Battle(verbosity=0), n)
+    profiled = Battle(verbosity=0, profile=True)
+    profiled_time, profiled_results = time_battles(profiled, n)
+    assert plain_results == profiled_results
+
+    print(f"{n} battles")
+    print(f"profile off: {n / plain_time:10.0f} battles/s")
+    print(f"profile on:  {n / profiled_time:10.0f} battles/s ({profiled_time / plain_time - 1:+.0%} time)")
+    print(profiled.stats.to_json(indent=2))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
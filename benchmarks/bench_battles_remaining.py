@@ -0,0 +1,53 @@
+"""
+Cost of BattleTower.battles_remaining, which runs before every battle, across tower sizes:
+the original scan (exporting the lives queue on every step) against the live-team counter.
+
+Usage: python -m benchmarks.bench_battles_remaining
+"""
+import timeit
+
+from random_gen import RandomGen
+from tower import BattleTower
+
+SIZES = [10, 100, 1000, 10000]
+# The scan exports the whole queue for each of its n steps, so larger towers take minutes.
+SCAN_MAX_SIZE = 100
+
+
+def scan_remaining(tower: BattleTower) -> bool:
+    """The original battles_remaining."""
+    if tower.player_lives == 0:
+        return False
+    for i in range(tower.tower_lives.get_length()):
+        if tower.tower_lives.export()[i] > 0:
+            return True
+    return False
+
+
+def scan_worst_case(tower: BattleTower) -> None:
+    """The scan returns at the first team with lives; time the full scan, as when only the last team is alive."""
+    for i in range(tower.tower_lives.get_length()):
+        tower.tower_lives.export()[i] > 0
+
+
+def us_per_call(fn, tower: BattleTower) -> float:
+    timer = timeit.Timer(lambda: fn(tower))
+    number, _ = timer.autorange()
+    return min(timer.repeat(3, number)) / number * 1e6
+
+
+def run() -> None:
+    print(f"{'teams':>6} {'scan us/battle':>15} {'counter us/battle':>18}")
+    for size in SIZES:
+        RandomGen.set_seed(size)
+        tower = BattleTower()
+        tower.set_my_team(None)
+        tower.generate_teams(size)
+        assert tower.battles_remaining() == scan_remaining(tower)
+        scan = us_per_call(scan_worst_case, tower) if size <= SCAN_MAX_SIZE else float("nan")
+        counter = us_per_call(BattleTower.battles_remaining, tower)
+        print(f"{size:>6} {scan:>15.2f} {counter:>18.3f}")
+
+
+if __name__ == "__main__":
+    run()
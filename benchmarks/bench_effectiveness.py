@@ -0,0 +1,50 @@
+"""
+Compares the cost of an effectiveness lookup with the original
+scan-based implementation against the precomputed matrix.
+
+Usage: python -m benchmarks.bench_effectiveness [lookups]
+"""
+import math
+import sys
+import timeit
+
+from elements import EffectivenessCalculator, Element
+
+
+def scan_lookup(type1: Element, type2: Element) -> float:
+    """The original lookup: re-parses every element name on each call."""
+    n = int(math.sqrt(len(EffectivenessCalculator.effectiveness_values)))
+    for i in range(len(EffectivenessCalculator.element_names)):
+        if Element.from_string(EffectivenessCalculator.element_names[i]) == type1:
+            index_attacking = i
+        if Element.from_string(EffectivenessCalculator.element_names[i]) == type2:
+            index_defending = i
+    return EffectivenessCalculator.effectiveness_values[n*index_attacking+index_defending]
+
+
+def run(lookups: int) -> None:
+    EffectivenessCalculator.get_instance()
+    pairs = [(a, b) for a in Element for b in Element]
+    for a, b in pairs:
+        assert scan_lookup(a, b) == EffectivenessCalculator.get_effectiveness(a, b)
+
+    def old():
+        for a, b in pairs:
+            scan_lookup(a, b)
+
+    def new():
+        for a, b in pairs:
+            EffectivenessCalculator.get_effectiveness(a, b)
+
+    rounds = max(1, lookups // len(pairs))
+    old_time = timeit.timeit(old, number=rounds)
+    new_time = timeit.timeit(new, number=rounds)
+    total = rounds * len(pairs)
+    print(f"{total} lookups")
+    print(f"scan:   {old_time / total * 1e9:10.1f} ns/lookup")
+    print(f"matrix: {new_time / total * 1e9:10.1f} ns/lookup")
+    print(f"speedup: {old_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
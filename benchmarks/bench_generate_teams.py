@@ -0,0 +1,52 @@
+"""
+Time to generate n tower teams with the per-team constructor path
+(MonsterTeam(BACK, RANDOM) plus a lives draw) against BattleTower.generate_teams,
+which builds teams from the precomputed spawn table, and against streaming them with iter_teams.
+
+Usage: python -m benchmarks.bench_generate_teams [n]
+"""
+import sys
+import time
+
+from helpers import get_all_monsters
+from random_gen import RandomGen
+from team import MonsterTeam
+from tower import BattleTower
+
+SEED = 123
+
+
+def constructor_path(n: int) -> list:
+    """The original generate_teams loop."""
+    teams = []
+    for _ in range(n):
+        team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
+        teams.append((team, RandomGen.randint(BattleTower.MIN_LIVES, BattleTower.MAX_LIVES)))
+    return teams
+
+
+def timed(fn, n: int) -> float:
+    RandomGen.set_seed(SEED)
+    start = time.perf_counter()
+    fn(n)
+    return time.perf_counter() - start
+
+
+def run(n: int) -> None:
+    get_all_monsters()
+    RandomGen.set_seed(SEED)
+    expected = [(str(team.team), lives) for team, lives in constructor_path(min(n, 1000))]
+    RandomGen.set_seed(SEED)
+    assert [(str(team.team), lives) for team, lives in BattleTower.iter_teams(min(n, 1000))] == expected
+
+    old = timed(constructor_path, n)
+    bulk = timed(lambda k: BattleTower().generate_teams(k), n)
+    stream = timed(lambda k: sum(1 for _ in BattleTower.iter_teams(k)), n)
+    print(f"{n} teams")
+    print(f"constructor path: {old:7.3f} s")
+    print(f"generate_teams:   {bulk:7.3f} s ({old / bulk:.1f}x)")
+    print(f"iter_teams:       {stream:7.3f} s ({old / stream:.1f}x)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
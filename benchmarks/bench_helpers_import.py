@@ -0,0 +1,46 @@
+"""
+Startup cost of `import helpers` and of building the monster catalog,
+with no snapshot (YAML parse) and with a snapshot of the parsed YAML.
+
+Each measurement runs a fresh interpreter, so import caches don't carry over.
+
+Usage: python -m benchmarks.bench_helpers_import [runs]
+"""
+import os
+import subprocess
+import sys
+import time
+
+import helpers
+
+IMPORT_ONLY = "import helpers"
+FIRST_USE = "import helpers; helpers.get_all_monsters()"
+
+
+def time_startup(code: str, runs: int, snapshot: bool) -> float:
+    """Median milliseconds to run `code` in a new interpreter, minus a bare interpreter start."""
+    def median_ms(source: str) -> float:
+        times = []
+        for _ in range(runs):
+            if not snapshot and os.path.exists(helpers.SNAPSHOT_FILE):
+                os.remove(helpers.SNAPSHOT_FILE)
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", source], check=True)
+            times.append((time.perf_counter() - start) * 1e3)
+        times.sort()
+        return times[len(times) // 2]
+    return median_ms(code) - median_ms("pass")
+
+
+def run(runs: int) -> None:
+    print(f"{'':32} {'no snapshot ms':>15} {'snapshot ms':>12}")
+    for label, code in (("import helpers", IMPORT_ONLY), ("import + get_all_monsters()", FIRST_USE)):
+        cold = time_startup(code, runs, snapshot=False)
+        # Make sure the snapshot exists before the warm runs.
+        subprocess.run([sys.executable, "-c", FIRST_USE], check=True)
+        warm = time_startup(code, runs, snapshot=True)
+        print(f"{label:32} {cold:15.1f} {warm:12.1f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
@@ -0,0 +1,44 @@
+"""
+Time to `import battle` in a fresh interpreter, against an import-time budget.
+
+Importing battle should only define classes: the effectiveness table and the
+monster catalog are loaded on first use, and NumPy/PyYAML are not imported.
+
+Usage: python -m benchmarks.bench_import_battle [runs]
+"""
+import subprocess
+import sys
+import time
+
+# Milliseconds on top of a bare interpreter start.
+IMPORT_BUDGET_MS = 150
+
+CHECK = (
+    "import sys, battle, elements, helpers\n"
+    "assert elements.EffectivenessCalculator.instance is None, 'effectiveness table loaded at import'\n"
+    "assert helpers._monsters is None, 'monster catalog loaded at import'\n"
+    "assert 'numpy' not in sys.modules and 'yaml' not in sys.modules, 'heavy dependency imported'\n"
+)
+
+
+def median_ms(source: str, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", source], check=True)
+        times.append((time.perf_counter() - start) * 1e3)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def run(runs: int) -> None:
+    subprocess.run([sys.executable, "-c", CHECK], check=True)
+    elapsed = median_ms("import battle", runs) - median_ms("pass", runs)
+    status = "within" if elapsed <= IMPORT_BUDGET_MS else "OVER"
+    print(f"import battle: {elapsed:.1f} ms ({status} the {IMPORT_BUDGET_MS} ms budget)")
+    if elapsed > IMPORT_BUDGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
@@ -0,0 +1,50 @@
+"""
+ComplexStats getter cost per formula size: the compiled formula alone against a LevelCache
+lookup, and what ComplexStats does for each (it caches from CACHE_MIN_OPS operations up).
+Levels cycle through 1..MAX_LEVEL, as in a long tower.
+
+Usage: python -m benchmarks.bench_level_cache
+"""
+import timeit
+
+from data_structures.referential_array import ArrayR
+from stats import ComplexStats, LevelCache, compile_formula
+
+MAX_LEVEL = 50
+CALLS = 200000
+
+# (name, formula); ops counts the level-dependent operations.
+FORMULAS = [
+    ("constant, 0 ops", ["7"]),
+    ("level, 0 ops", ["level"]),
+    ("level*2, 1 op", ["level", "2", "*"]),
+    ("level*2+1, 2 ops", ["level", "2", "*", "1", "+"]),
+    ("4 ops", ["level", "2", "*", "level", "sqrt", "+", "1", "-"]),
+    ("8 ops", ["level", "2", "power", "level", "sqrt", "*", "level", "3", "/", "+", "level", "1", "+", "2", "3", "middle", "-"]),
+]
+
+
+def seconds_per_million(fn) -> float:
+    levels = [1 + i % MAX_LEVEL for i in range(CALLS)]
+
+    def loop():
+        for level in levels:
+            fn(level)
+    return min(timeit.repeat(loop, number=1, repeat=5)) / CALLS * 1e6
+
+
+def run() -> None:
+    print(f"{'formula':>18} {'uncached s/1M':>14} {'cached s/1M':>12} {'ComplexStats s/1M':>18}")
+    for name, tokens in FORMULAS:
+        formula = ArrayR.from_list(tokens)
+        function = compile_formula(formula)
+        cache = LevelCache(ComplexStats.CACHE_SIZE)
+        stats = ComplexStats(formula, formula, formula, formula)
+        uncached = seconds_per_million(function)
+        cached = seconds_per_million(lambda level: cache.get(level, function))
+        chosen = seconds_per_million(stats.get_attack)
+        print(f"{name:>18} {uncached:>14.3f} {cached:>12.3f} {chosen:>18.3f}")
+
+
+if __name__ == "__main__":
+    run()
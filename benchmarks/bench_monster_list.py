@@ -0,0 +1,83 @@
+"""
+Cost of MonsterList append/insert/delete patterns across list sizes,
+against the original list that reallocated and copied on every change.
+
+Usage: python -m benchmarks.bench_monster_list
+"""
+import time
+
+from data_structures.abstract_list import MonsterList
+from data_structures.referential_array import ArrayR
+
+SIZES = [6, 100, 1000, 10000, 100000]
+# Copying every element on every change makes larger sizes take minutes.
+COPYING_MAX_SIZE = 1000
+# Front churn is O(size) per operation, so fewer operations are timed on big lists.
+MAX_CHURN_OPS = 1000
+
+
+class CopyingList:
+    """The original MonsterList storage: an exactly-sized ArrayR, copied on every insert/delete."""
+
+    def __init__(self) -> None:
+        self.array = ArrayR(0)
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def append(self, item) -> None:
+        self.insert(len(self.array), item)
+
+    def insert(self, index: int, item) -> None:
+        new_array = ArrayR(len(self.array)+1)
+        for i in range(index):
+            new_array[i] = self.array[i]
+        new_array[index] = item
+        for i in range(index, len(self.array)):
+            new_array[i+1] = self.array[i]
+        self.array = new_array
+
+    def delete_at_index(self, index: int) -> None:
+        new_array = ArrayR(len(self.array)-1)
+        for i in range(index):
+            new_array[i] = self.array[i]
+        for i in range(index, len(self.array)-1):
+            new_array[i] = self.array[i+1]
+        self.array = new_array
+
+
+def time_per_op(make, size: int, pattern: str) -> float:
+    """Microseconds per operation of the given pattern on a list of the given size."""
+    lst = make()
+    if pattern == "append":
+        start = time.perf_counter()
+        for i in range(size):
+            lst.append(i)
+        return (time.perf_counter() - start) / size * 1e6
+    for i in range(size):
+        lst.append(i)
+    ops = max(10, min(MAX_CHURN_OPS, 100000 // size))
+    start = time.perf_counter()
+    for i in range(ops):
+        if pattern == "back":
+            # TeamMode.BACK: add to the back, retrieve from the front.
+            lst.append(i)
+            lst.delete_at_index(0)
+        else:
+            # TeamMode.FRONT: add to the front, retrieve from the front.
+            lst.insert(0, i)
+            lst.delete_at_index(0)
+    return (time.perf_counter() - start) / (2 * ops) * 1e6
+
+
+def run() -> None:
+    print(f"{'pattern':>8} {'size':>8} {'copying us/op':>14} {'MonsterList us/op':>18}")
+    for pattern in ("append", "back", "front"):
+        for size in SIZES:
+            copying = time_per_op(CopyingList, size, pattern) if size <= COPYING_MAX_SIZE else float("nan")
+            growable = time_per_op(MonsterList, size, pattern)
+            print(f"{pattern:>8} {size:>8} {copying:>14.2f} {growable:>18.2f}")
+
+
+if __name__ == "__main__":
+    run()
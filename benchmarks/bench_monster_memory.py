@@ -0,0 +1,57 @@
+"""
+Bytes per monster instance with the slotted layout against a dict-backed one,
+and per monster held in a MonsterRoster.
+
+Usage: python -m benchmarks.bench_monster_memory [instances]
+"""
+import sys
+import time
+import tracemalloc
+
+from helpers import Flamikin
+from roster import MonsterRoster
+
+
+class DictFlamikin(Flamikin):
+    """Declaring no __slots__ brings back a per-instance __dict__, as monsters had before."""
+
+
+def measure(cls, n: int) -> tuple[float, float]:
+    """Returns (bytes per instance, microseconds per instance) for creating n instances of cls."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    monsters = [cls() for _ in range(n)]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del monsters
+    return size / n, elapsed / n * 1e6
+
+
+def measure_roster(n: int) -> tuple[float, float]:
+    """Returns (bytes per monster, microseconds per monster) for spawning n monsters in a roster."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    roster = MonsterRoster(simple_mode=True)
+    roster.spawn_many([roster.class_id_of(Flamikin)] * n)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del roster
+    return size / n, elapsed / n * 1e6
+
+
+def run(n: int) -> None:
+    assert not hasattr(Flamikin(), "__dict__")
+    dict_bytes, dict_time = measure(DictFlamikin, n)
+    slot_bytes, slot_time = measure(Flamikin, n)
+    print(f"{n} instances (bytes include the list holding them)")
+    print(f"dict-backed: {dict_bytes:7.1f} bytes/instance, {dict_time:6.2f} us/instance")
+    print(f"slotted:     {slot_bytes:7.1f} bytes/instance, {slot_time:6.2f} us/instance")
+    print(f"memory saved: {1 - slot_bytes / dict_bytes:.0%}")
+    roster_bytes, roster_time = measure_roster(n)
+    print(f"roster:      {roster_bytes:7.1f} bytes/monster,  {roster_time:6.2f} us/monster")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,39 @@
+"""
+Cost per number of n sequential RandomGen.random()/randint() calls against
+random_batch(n)/randint_batch(lo, hi, n), which return the same sequence.
+
+Usage: python -m benchmarks.bench_random_batch
+"""
+import time
+
+from random_gen import RandomGen
+
+SIZES = [10, 1000, 100000, 1000000]
+SEED = 2024
+
+
+def ns_per_number(fn, n: int) -> float:
+    RandomGen.set_seed(SEED)
+    start = time.perf_counter()
+    fn(n)
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def run() -> None:
+    # Build the step table first, so its one-off cost isn't counted.
+    RandomGen.random_batch(RandomGen.BATCH_CHUNK)
+    print(f"{'n':>8} {'random ns':>10} {'random_batch ns':>16} {'randint ns':>11} {'randint_batch ns':>17}")
+    for n in SIZES:
+        RandomGen.set_seed(SEED)
+        expected = [RandomGen.randint(1, 6) for _ in range(n)]
+        RandomGen.set_seed(SEED)
+        assert RandomGen.randint_batch(1, 6, n).tolist() == expected
+        single = ns_per_number(lambda k: [RandomGen.random() for _ in range(k)], n)
+        batch = ns_per_number(RandomGen.random_batch, n)
+        single_int = ns_per_number(lambda k: [RandomGen.randint(1, 6) for _ in range(k)], n)
+        batch_int = ns_per_number(lambda k: RandomGen.randint_batch(1, 6, k), n)
+        print(f"{n:>8} {single:>10.1f} {batch:>16.1f} {single_int:>11.1f} {batch_int:>17.1f}")
+
+
+if __name__ == "__main__":
+    run()
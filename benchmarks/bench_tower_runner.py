@@ -0,0 +1,36 @@
+"""
+Scaling of run_towers with the number of worker processes.
+
+Usage: python -m benchmarks.bench_tower_runner [towers] [teams_per_tower]
+"""
+import os
+import sys
+import time
+
+from tower import run_towers
+
+
+def run(towers: int, n_teams: int) -> None:
+    seeds = range(towers)
+    start = time.perf_counter()
+    baseline = run_towers(seeds, n_teams, max_workers=0)
+    serial_time = time.perf_counter() - start
+    print(f"{towers} towers of {n_teams} teams, {baseline.battles} battles")
+    print(f"in-process: {serial_time:8.2f}s")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        report = run_towers(seeds, n_teams, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        assert [s.as_tuple() for s in report.summaries] == [s.as_tuple() for s in baseline.summaries]
+        print(f"{workers:3d} workers: {elapsed:8.2f}s  speedup {serial_time / elapsed:5.2f}x")
+        workers *= 2
+    print(baseline)
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
@@ -0,0 +1,54 @@
+"""
+Memory held by a consumer that keeps every tower battle's output: the tuples from
+iterating a BattleTower (which hold live teams, and keep defeated teams in dead_teams)
+against BattleRecords from BattleTower.stream. Also times the bounded-queue stream.
+
+Usage: python -m benchmarks.bench_tower_stream [towers] [teams_per_tower]
+"""
+import sys
+import time
+import tracemalloc
+
+from battle import Battle
+from random_gen import RandomGen
+from team import MonsterTeam
+from tower import BattleTower
+
+
+def make_tower(seed: int, n_teams: int) -> BattleTower:
+    RandomGen.set_seed(seed)
+    tower = BattleTower(Battle(verbosity=0))
+    tower.set_my_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM))
+    tower.generate_teams(n_teams)
+    return tower
+
+
+def kept_outputs(towers: int, n_teams: int, mode: str) -> tuple[int, float, float]:
+    """Returns (battles, peak KiB held, seconds) for keeping every output of `towers` towers."""
+    kept = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for seed in range(towers):
+        tower = make_tower(seed, n_teams)
+        if mode == "iterate":
+            kept.extend(tower)
+        else:
+            kept.extend(tower.stream(maxsize=256 if mode == "queued" else 0))
+        del tower
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(kept), peak / 1024, elapsed
+
+
+def run(towers: int, n_teams: int) -> None:
+    print(f"{towers} towers of {n_teams} teams, consumer keeps every output")
+    for mode in ("iterate", "stream", "queued"):
+        battles, peak, elapsed = kept_outputs(towers, n_teams, mode)
+        print(f"{mode:>8}: {battles} battles, peak {peak:9.1f} KiB, {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    towers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_teams = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(towers, n_teams)
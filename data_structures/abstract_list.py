@@ -72,63 +72,120 @@ class List(ABC, Generic[T]):
         self.length = 0
 
 class MonsterList(List):
-    
+    """ List ADT implemented with a growable array.
+
+    Attributes:
+         length (int): number of elements in the list (inherited)
+         array (ArrayR[T]): storage for the elements; only the first `length` slots are in use
+
+    The array doubles when full and halves when at most a quarter full,
+    so append is O(1) amortized and insert/delete only shift elements in place.
+    """
+    MIN_CAPACITY = 1
+
     def __init__(self) -> None:
-        """Initializes an empty ArrayR and sets the length to 0.
+        """Initializes an empty list with MIN_CAPACITY slots.
         :complexity: O(1)
         """
         self.length = 0
-        self.array = ArrayR(0)
-    
+        self.array = ArrayR(self.MIN_CAPACITY)
+
     def __getitem__(self, index: int) -> T:
-        return self.array[index]
-    
+        """Returns the item at a given index, counting from the back if negative.
+        :raises IndexError: if the index is out of range
+        :complexity: O(1)
+        """
+        return self.array[self._check_index(index)]
+
     def __setitem__(self, index: int, item: T) -> None:
-        self.array[index] = item
+        """Replaces the item at a given index, counting from the back if negative.
+        :raises IndexError: if the index is out of range
+        :complexity: O(1)
+        """
+        self.array[self._check_index(index)] = item
+
+    def _check_index(self, index: int) -> int:
+        """Returns index as a non-negative position in the list."""
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            raise IndexError("list index out of range")
+        return index
+
+    def is_full(self) -> bool:
+        """The list grows as needed, so it is never full.
+        :complexity: O(1)
+        """
+        return False
 
-    def insert(self, index: int, item: T) -> None:
-        """Inserts an item at a given index.
+    def _resize(self, capacity: int) -> None:
+        """Moves the items into a new array with the given number of slots.
         :complexity: O(n) where n is the size of the list
         """
-        if index > len(self.array) or index < 0:
-            raise IndexError("To insert a value into a list you must provide an index in the range of the list")
-        
-        new_array = ArrayR(len(self.array)+1)
-        
-        for i in range(index):
+        new_array = ArrayR(max(self.MIN_CAPACITY, capacity))
+        for i in range(self.length):
             new_array[i] = self.array[i]
-        new_array[index] = item
-        
-        for i in range(index, len(self.array)):
-            new_array[i+1] = self.array[i]
-
-            
         self.array = new_array
+
+    def _shuffle_right(self, index: int) -> None:
+        """Shuffles items from a given position one slot to the right."""
+        for i in range(self.length, index, -1):
+            self.array[i] = self.array[i - 1]
+
+    def _shuffle_left(self, index: int) -> None:
+        """Shuffles items after a given position one slot to the left."""
+        for i in range(index, self.length - 1):
+            self.array[i] = self.array[i + 1]
+
+    def append(self, item: T) -> None:
+        """Appends an item to the end of the list.
+        :complexity: O(1) amortized, O(n) when the array has to grow
+        """
+        if self.length == len(self.array):
+            self._resize(2 * len(self.array))
+        self.array[self.length] = item
         self.length += 1
 
+    def insert(self, index: int, item: T) -> None:
+        """Inserts an item at a given index.
+        :complexity: O(n-index) amortized, where n is the size of the list
+        """
+        if index > self.length or index < 0:
+            raise IndexError("To insert a value into a list you must provide an index in the range of the list")
+        if self.length == len(self.array):
+            self._resize(2 * len(self.array))
+        self._shuffle_right(index)
+        self.array[index] = item
+        self.length += 1
 
     def delete_at_index(self, index: int) -> T:
-        """Deletes an item at a given index.
-        :complexity: O(n) where n is the size of the list
+        """Deletes and returns the item at a given index.
+        :complexity: O(n-index) amortized, where n is the size of the list
         """
         if index >= self.length or index < 0:
             raise ValueError("To delete a value in the list you must provide an index in the range of the list")
-        #make shorter array
-        new_array = ArrayR(len(self.array)-1)
-        #up until index, add stuff back on
-        for i in range(index):
-            new_array[i] = self.array[i]
-        for i in range(index,len(self.array)-1):
-            new_array[i] = self.array[i+1]
-        self.array = new_array
-        self.length-=1
+        item = self.array[index]
+        self._shuffle_left(index)
+        self.length -= 1
+        # Drop the reference so deleted monsters can be collected.
+        self.array[self.length] = None
+        if self.length <= len(self.array) // 4:
+            self._resize(len(self.array) // 2)
+        return item
+
+    def clear(self) -> None:
+        """Empties the list and releases its storage.
+        :complexity: O(1)
+        """
+        self.length = 0
+        self.array = ArrayR(self.MIN_CAPACITY)
 
     def index(self, item: T, strict: bool=False) -> int:
         """Returns the index of a given item.
         :complexity: O(n) where n is the size of the list
         """
 
-        for i in range(len(self.array)):
+        for i in range(self.length):
             if self.array[i] == item:
                 return i
         if strict:
@@ -143,6 +200,7 @@ class MonsterList(List):
             raise TypeError("You can only add a list to a list")
         
         self_copy = MonsterList()
+        self_copy._resize(len(self) + len(other_list))
         for i in range(len(self)):  
             self_copy.append(self[i])
         
@@ -153,58 +211,95 @@ class MonsterList(List):
 
 
     def sort(self, descending:bool, sort_func):
-        """Sorts the list using bubble sort.
-        :complexity: O(n^2) where n is the size of the list
+        """Stable sort of the list by sort_func, largest first if descending.
+
+        Each item's key is computed once, then the (key, item) pairs are merge sorted
+        bottom-up. Items with equal keys keep their relative order in both directions.
+        :complexity: O(n log n) where n is the size of the list, with n calls to sort_func
+        """
+        n = self.length
+        keys = ArrayR(n)
+        items = ArrayR(n)
+        for i in range(n):
+            items[i] = self.array[i]
+            keys[i] = sort_func(items[i])
+        key_buffer = ArrayR(n)
+        item_buffer = ArrayR(n)
+
+        width = 1
+        while width < n:
+            for lo in range(0, n, 2 * width):
+                mid = min(lo + width, n)
+                hi = min(lo + 2 * width, n)
+                self._merge(keys, items, key_buffer, item_buffer, lo, mid, hi, descending)
+            keys, key_buffer = key_buffer, keys
+            items, item_buffer = item_buffer, items
+            width *= 2
+
+        for i in range(n):
+            self.array[i] = items[i]
+
+    @staticmethod
+    def _merge(keys, items, key_out, item_out, lo: int, mid: int, hi: int, descending: bool) -> None:
+        """Merges the sorted runs [lo, mid) and [mid, hi) into the same positions of the output arrays.
+        Ties take from the left run first, which keeps the sort stable.
+        :complexity: O(hi - lo)
         """
-        values = self.array
-
-        # Bubble sort values
-        n = len(values)
-        for mark in range(n-1, 0, -1):
-            swapped = False
-            for i in range(mark):
-                if descending:
-                    if sort_func(values[i]) < sort_func(values[i + 1]):
-                        temp = values[i + 1]
-                        values[i + 1] = values[i]
-                        values[i] = temp
-                        swapped = True
-                else:
-                    if sort_func(values[i]) > sort_func(values[i + 1]):
-                        temp = values[i + 1]
-                        values[i + 1] = values[i]
-                        values[i] = temp
-                        swapped = True
-            if not swapped:
-                break
+        i = lo
+        j = mid
+        for k in range(lo, hi):
+            if j >= hi:
+                take_left = True
+            elif i >= mid:
+                take_left = False
+            elif descending:
+                take_left = keys[i] >= keys[j]
+            else:
+                take_left = keys[i] <= keys[j]
+            if take_left:
+                key_out[k] = keys[i]
+                item_out[k] = items[i]
+                i += 1
+            else:
+                key_out[k] = keys[j]
+                item_out[k] = items[j]
+                j += 1
 
     def front_swap(self, dist):
-        """Swaps the front item with another item at a given distance.
+        """Swaps the front item with the item at a given distance, wrapping around.
         :complexity: O(1)
         """
-        temp = self.array[self.front]
-        self.array[self.front] = self.array[(self.front+dist)%len(self.array)]
-        self.array[(self.front+dist)%len(self.array)] = temp
+        if self.length == 0:
+            return
+        other = dist % self.length
+        temp = self.array[0]
+        self.array[0] = self.array[other]
+        self.array[other] = temp
+
+    def _reverse(self, start: int, end: int) -> None:
+        """Reverses the items from start up to (not including) end, in place."""
+        end -= 1
+        while start < end:
+            temp = self.array[start]
+            self.array[start] = self.array[end]
+            self.array[end] = temp
+            start += 1
+            end -= 1
 
     def flip_halves(self):
-        """Flips the two halves of the list.
-        :complexity: O(n) where n is the size of the list
+        """Moves the back half, reversed, in front of the front half.
+        e.g. [1, 2, 3, 4, 5] becomes [5, 4, 3, 1, 2]
+        :complexity: O(n) where n is the size of the list, with O(1) extra space
         """
-        values = self.array
-        
-        front_len = len(values)//2
-        front_part = MonsterList(front_len)
-        back_part = MonsterList(self.length-front_len)
-        for i in range(self.length):
-            if i <= front_len-1:
-                front_part.append(values[i])
-            else:
-                back_part.insert(0,values[i])
-        self.array =  back_part + front_part
+        front_len = self.length // 2
+        # Reversing everything gives [reversed back, reversed front],
+        # so un-reversing the last front_len items finishes the flip.
+        self._reverse(0, self.length)
+        self._reverse(self.length - front_len, self.length)
 
                     
     def get_array(self):
-        """Returns the internal ArrayR.
+        """Returns the internal ArrayR. Only the first len(self) slots are in use.
         :complexity: O(1)
         """
         return self.array
@@ -276,6 +371,41 @@ class TestMonsterList(unittest.TestCase):
         self.assertEqual(ml[0], 1)
         self.assertEqual(ml[2], 3)
 
+    def test_sort_stable(self):
+        ml = MonsterList()
+        for item in [(2, "a"), (1, "b"), (2, "c"), (3, "d"), (1, "e"), (2, "f")]:
+            ml.append(item)
+        calls = []
+        def key(x):
+            calls.append(x)
+            return x[0]
+        ml.sort(descending=True, sort_func=key)
+        self.assertEqual(len(calls), 6)
+        self.assertEqual([ml[i][1] for i in range(len(ml))], ["d", "a", "c", "f", "b", "e"])
+        ml.sort(descending=False, sort_func=lambda x: x[0])
+        self.assertEqual([ml[i][1] for i in range(len(ml))], ["b", "e", "a", "c", "f", "d"])
+
+    def test_grow_and_shrink(self):
+        ml = MonsterList()
+        for i in range(100):
+            ml.append(i)
+        self.assertEqual(len(ml), 100)
+        self.assertGreaterEqual(len(ml.get_array()), 100)
+        self.assertEqual(ml[-1], 99)
+        with self.assertRaises(IndexError):
+            ml[100]
+        for i in range(95):
+            self.assertEqual(ml.delete_at_index(0), i)
+        self.assertEqual([ml[i] for i in range(len(ml))], [95, 96, 97, 98, 99])
+        self.assertLess(len(ml.get_array()), 100)
+
+    def test_flip_halves(self):
+        ml = MonsterList()
+        for i in range(1, 6):
+            ml.append(i)
+        ml.flip_halves()
+        self.assertEqual([ml[i] for i in range(len(ml))], [5, 4, 3, 1, 2])
+
 
 
 if __name__ == "__main__":
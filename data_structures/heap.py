@@ -0,0 +1,231 @@
+""" Binary heap keyed by a sort function, with stable tie-breaking.
+
+Used to keep OPTIMISE teams in order without re-sorting the whole team
+on every insertion. Also defines UnitTests for the class.
+"""
+__docformat__ = 'reStructuredText'
+
+import unittest
+from typing import Callable, Generic, Optional
+from data_structures.referential_array import ArrayR, T
+
+
+class ArrayHeap(Generic[T]):
+    """ Array-based binary heap. The item with the highest priority is at the root.
+
+    Priority is the key given by `sort_func` when an item is added: the largest key
+    if descending, else the smallest. Ties go to the most recently added item,
+    which matches inserting at the front and then stable-sorting.
+
+    Attributes:
+         length (int): number of items in the heap
+         array (ArrayR[tuple]): (key, sequence number, item) entries in heap order
+         descending (bool): whether larger keys have higher priority
+         sort_func: function giving the key of an item
+    """
+    MIN_CAPACITY = 1
+
+    def __init__(self, sort_func: Callable[[T], object], descending: bool = True, max_capacity: int = 1) -> None:
+        self.length = 0
+        self.array = ArrayR(max(self.MIN_CAPACITY, max_capacity))
+        self.descending = descending
+        self.sort_func = sort_func
+        self.counter = 0
+
+    def __len__(self) -> int:
+        """ Returns the number of items in the heap. """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """ True if the heap is empty. """
+        return self.length == 0
+
+    def is_full(self) -> bool:
+        """ The heap grows as needed, so it is never full. """
+        return False
+
+    def __getitem__(self, index: int) -> T:
+        """ Returns the item at a given position of the heap array (not in priority order).
+        :raises IndexError: if the index is out of range
+        :complexity: O(1)
+        """
+        if index < 0 or index >= self.length:
+            raise IndexError("heap index out of range")
+        return self.array[index][2]
+
+    def _higher(self, a: tuple, b: tuple) -> bool:
+        """ True if entry a has a higher priority than entry b. """
+        if a[0] != b[0]:
+            return (a[0] > b[0]) == self.descending
+        return a[1] > b[1]
+
+    def _rise(self, k: int) -> None:
+        """ Moves the entry at position k up until its parent has a higher priority.
+        :complexity: O(log n)
+        """
+        entry = self.array[k]
+        while k > 0:
+            parent = (k - 1) // 2
+            if not self._higher(entry, self.array[parent]):
+                break
+            self.array[k] = self.array[parent]
+            k = parent
+        self.array[k] = entry
+
+    def _sink(self, k: int) -> None:
+        """ Moves the entry at position k down until both children have a lower priority.
+        :complexity: O(log n)
+        """
+        entry = self.array[k]
+        while 2 * k + 1 < self.length:
+            child = 2 * k + 1
+            if child + 1 < self.length and self._higher(self.array[child + 1], self.array[child]):
+                child += 1
+            if not self._higher(self.array[child], entry):
+                break
+            self.array[k] = self.array[child]
+            k = child
+        self.array[k] = entry
+
+    def _heapify(self) -> None:
+        """ Restores heap order over the whole array.
+        :complexity: O(n)
+        """
+        for k in range(self.length // 2 - 1, -1, -1):
+            self._sink(k)
+
+    def _push(self, entry: tuple) -> None:
+        if self.length == len(self.array):
+            new_array = ArrayR(2 * len(self.array))
+            for i in range(self.length):
+                new_array[i] = self.array[i]
+            self.array = new_array
+        self.array[self.length] = entry
+        self.length += 1
+        self._rise(self.length - 1)
+
+    def _pop(self) -> tuple:
+        entry = self.array[0]
+        self.length -= 1
+        if self.length > 0:
+            self.array[0] = self.array[self.length]
+            self._sink(0)
+        self.array[self.length] = None
+        return entry
+
+    def add(self, item: T) -> None:
+        """ Adds an item, keyed by sort_func(item) at the time it is added.
+        :complexity: O(log n) amortized, where n is the number of items
+        """
+        self.counter += 1
+        self._push((self.sort_func(item), self.counter, item))
+
+    def peek(self) -> T:
+        """ Returns the item with the highest priority.
+        :raises Exception: if the heap is empty
+        :complexity: O(1)
+        """
+        if self.is_empty():
+            raise Exception("Heap is empty")
+        return self.array[0][2]
+
+    def get_max(self) -> T:
+        """ Removes and returns the item with the highest priority.
+        :raises Exception: if the heap is empty
+        :complexity: O(log n)
+        """
+        if self.is_empty():
+            raise Exception("Heap is empty")
+        return self._pop()[2]
+
+    def pop_where(self, predicate: Callable[[T], bool]) -> Optional[T]:
+        """ Removes and returns the highest-priority item for which predicate(item) holds,
+        or None if there is none. Skipped items keep their key and tie order.
+        :complexity: O((s+1) log n) where s is the number of items skipped
+        """
+        skipped = ArrayR(max(self.MIN_CAPACITY, self.length))
+        n_skipped = 0
+        found = None
+        while self.length > 0:
+            entry = self._pop()
+            if predicate(entry[2]):
+                found = entry[2]
+                break
+            skipped[n_skipped] = entry
+            n_skipped += 1
+        for i in range(n_skipped):
+            self._push(skipped[i])
+        return found
+
+    def flip(self) -> None:
+        """ Reverses the priority direction. Tied items keep their relative order.
+        :complexity: O(n)
+        """
+        self.descending = not self.descending
+        self._heapify()
+
+    def rekey(self) -> None:
+        """ Recomputes every key with sort_func, for when the items have changed.
+        :complexity: O(n) calls to sort_func
+        """
+        for i in range(self.length):
+            _, seq, item = self.array[i]
+            self.array[i] = (self.sort_func(item), seq, item)
+        self._heapify()
+
+    def export(self) -> ArrayR[T]:
+        """ Returns the items in priority order, leaving the heap unchanged.
+        :complexity: O(n log n)
+        """
+        result = ArrayR(self.length)
+        copy = ArrayHeap(self.sort_func, self.descending, self.length)
+        for i in range(self.length):
+            copy.array[i] = self.array[i]
+        copy.length = self.length
+        for i in range(self.length):
+            result[i] = copy._pop()[2]
+        return result
+
+    def __str__(self) -> str:
+        """ String representation of the items in priority order. """
+        items = self.export()
+        return "[" + ", ".join(str(items[i]) for i in range(len(items))) + "]"
+
+
+class TestHeap(unittest.TestCase):
+    """ Tests for the above class."""
+
+    def test_order_and_ties(self):
+        heap = ArrayHeap(lambda x: x[0])
+        for item in [(3, "a"), (1, "b"), (3, "c"), (2, "d"), (1, "e")]:
+            heap.add(item)
+        # Ties go to the most recently added item.
+        self.assertEqual(heap.export().to_list(), [(3, "c"), (3, "a"), (2, "d"), (1, "e"), (1, "b")])
+        heap.flip()
+        self.assertEqual(heap.export().to_list(), [(1, "e"), (1, "b"), (2, "d"), (3, "c"), (3, "a")])
+        self.assertEqual(heap.get_max(), (1, "e"))
+        self.assertEqual(len(heap), 4)
+
+    def test_pop_where(self):
+        heap = ArrayHeap(lambda x: x)
+        for i in range(10):
+            heap.add(i)
+        self.assertEqual(heap.pop_where(lambda x: x % 4 == 0), 8)
+        self.assertIsNone(heap.pop_where(lambda x: x > 100))
+        self.assertEqual(heap.export().to_list(), [9, 7, 6, 5, 4, 3, 2, 1, 0])
+
+    def test_rekey(self):
+        values = {"a": 1, "b": 2}
+        heap = ArrayHeap(lambda x: values[x])
+        heap.add("a")
+        heap.add("b")
+        values["a"] = 5
+        self.assertEqual(heap.peek(), "b")
+        heap.rekey()
+        self.assertEqual(heap.peek(), "a")
+
+
+if __name__ == '__main__':
+    testtorun = TestHeap()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
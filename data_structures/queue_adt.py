@@ -8,7 +8,7 @@ __docformat__ = 'reStructuredText'
 
 import unittest
 from abc import ABC, abstractmethod
-from typing import Generic
+from typing import Generic, Iterator
 from data_structures.referential_array import ArrayR, T
 
 class Queue(ABC, Generic[T]):
@@ -149,15 +149,29 @@ class CircularMonsterQueue(Queue[T]):
         self.length += 1
         self.rear = (self.rear + 1) % len(self.array)
 
-    def export(self):
-        """ Exports the queue as a new array.
+    def export(self) -> ArrayR[T]:
+        """ Exports the queue as a new array, from front to rear.
         :complexity: O(n) where n is the length of the queue
         """
         values = ArrayR(self.length)
-        for i in range(self.front, self.front + self.length):
-            values[values.element_count()-1] = self.array[i%len(self.array)]
+        for i, item in enumerate(self):
+            values[i] = item
         return values
 
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the items from front to rear, reading the array in place.
+        The queue must not be changed while it is being iterated over.
+        :complexity: O(1) per item, with no copy of the queue
+        """
+        array = self.array
+        capacity = len(array)
+        position = self.front
+        for _ in range(self.length):
+            yield array[position]
+            position += 1
+            if position == capacity:
+                position = 0
+
     def serve(self) -> T:
         """ Deletes and returns the element at the queue's front.
         :pre: queue is not empty
@@ -205,6 +219,199 @@ class CircularMonsterQueue(Queue[T]):
         return self.length
 
 
+class GrowableMonsterQueue(CircularMonsterQueue[T]):
+    """ Circular queue that grows and shrinks with its contents, so it is never full.
+
+    Attributes are those of CircularMonsterQueue; max_capacity is the initial number of
+    slots and the smallest the array shrinks to. Item i of the queue lives at
+    array[(front + i) % len(array)].
+
+    The array doubles when an item is added to a full queue and halves when a removal leaves
+    it a quarter full, each time copying the items (unwrapped, to start at index 0) once.
+    Both happen at most once per O(n) operations, so append and serve are O(1) amortized.
+    """
+
+    def __init__(self, max_capacity: int = 1) -> None:
+        CircularMonsterQueue.__init__(self, max_capacity)
+
+    def _resize(self, capacity: int) -> None:
+        """ Moves the items, in order, to the start of a new array with the given number of slots.
+        :complexity: O(n) where n is the length of the queue
+        """
+        new_array = ArrayR(max(self.MIN_CAPACITY, capacity))
+        for i, item in enumerate(self):
+            new_array[i] = item
+        self.array = new_array
+        self.front = 0
+        self.rear = self.length % len(new_array)
+
+    def _grow_if_full(self) -> None:
+        if self.length == len(self.array):
+            self._resize(2 * len(self.array))
+
+    def _shrink_if_sparse(self) -> None:
+        capacity = len(self.array)
+        if self.length <= capacity // 4 and capacity // 2 >= self.max_capacity:
+            self._resize(capacity // 2)
+
+    def is_full(self) -> bool:
+        """ The queue grows as needed, so it is never full.
+        :complexity: O(1)
+        """
+        return False
+
+    def append(self, item: T) -> None:
+        """ Adds an element to the rear of the queue.
+        :complexity: O(1) amortized, O(n) when the array has to grow
+        """
+        self._grow_if_full()
+        self.array[self.rear] = item
+        self.length += 1
+        self.rear = (self.rear + 1) % len(self.array)
+
+    def serve(self) -> T:
+        """ Deletes and returns the element at the queue's front.
+        The freed slot is cleared, so served items can be garbage collected.
+        :raises Exception: if the queue is empty
+        :complexity: O(1) amortized, O(n) when the array shrinks
+        """
+        item = CircularMonsterQueue.serve(self)
+        self.array[(self.front - 1) % len(self.array)] = None
+        self._shrink_if_sparse()
+        return item
+
+    def clear(self) -> None:
+        """ Clears all elements from the queue, going back to the initial capacity.
+        :complexity: O(c) where c is the initial capacity
+        """
+        CircularMonsterQueue.clear(self)
+        self.array = ArrayR(max(self.MIN_CAPACITY, self.max_capacity))
+
+
+class CircularMonsterDeque(GrowableMonsterQueue[T]):
+    """ Double-ended growable circular queue with indexed access, used to store FRONT/BACK teams.
+
+    Attributes are those of GrowableMonsterQueue.
+    """
+
+    def __init__(self, max_capacity: int = 1) -> None:
+        GrowableMonsterQueue.__init__(self, max_capacity)
+
+    def _position(self, index: int) -> int:
+        """ Returns the array position of the item at a given index, counting from the back if negative.
+        :raises IndexError: if the index is out of range
+        :complexity: O(1)
+        """
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            raise IndexError("deque index out of range")
+        return (self.front + index) % len(self.array)
+
+    def __getitem__(self, index: int) -> T:
+        """ Returns the item at a given index from the front.
+        :complexity: O(1)
+        """
+        return self.array[self._position(index)]
+
+    def __setitem__(self, index: int, item: T) -> None:
+        """ Replaces the item at a given index from the front.
+        :complexity: O(1)
+        """
+        self.array[self._position(index)] = item
+
+    def prepend(self, item: T) -> None:
+        """ Adds an element to the front of the deque.
+        :complexity: O(1) amortized, O(n) when the array has to grow
+        """
+        self._grow_if_full()
+        self.front = (self.front - 1) % len(self.array)
+        self.array[self.front] = item
+        self.length += 1
+
+    def pop(self) -> T:
+        """ Deletes and returns the element at the deque's rear.
+        :raises Exception: if the deque is empty
+        :complexity: O(1) amortized, O(n) when the array shrinks
+        """
+        if self.is_empty():
+            raise Exception("Queue is empty")
+        self.rear = (self.rear - 1) % len(self.array)
+        item = self.array[self.rear]
+        self.array[self.rear] = None
+        self.length -= 1
+        self._shrink_if_sparse()
+        return item
+
+    def insert(self, index: int, item: T) -> None:
+        """ Inserts an item at a given index, shifting whichever side of it is shorter.
+        :raises IndexError: if the index is out of range
+        :complexity: O(min(index, n-index)) amortized, where n is the length of the deque
+        """
+        if index > self.length or index < 0:
+            raise IndexError("To insert a value into a list you must provide an index in the range of the list")
+        if index < self.length - index:
+            self.prepend(item)
+            for i in range(index):
+                self[i] = self[i + 1]
+        else:
+            self.append(item)
+            for i in range(self.length - 1, index, -1):
+                self[i] = self[i - 1]
+        self[index] = item
+
+    def delete_at_index(self, index: int) -> T:
+        """ Deletes and returns the item at a given index, shifting whichever side of it is shorter.
+        :raises ValueError: if the index is out of range
+        :complexity: O(min(index, n-index)) where n is the length of the deque
+        """
+        if index >= self.length or index < 0:
+            raise ValueError("To delete a value in the list you must provide an index in the range of the list")
+        item = self[index]
+        if index < self.length - 1 - index:
+            for i in range(index, 0, -1):
+                self[i] = self[i - 1]
+            self.serve()
+        else:
+            for i in range(index, self.length - 1):
+                self[i] = self[i + 1]
+            self.pop()
+        return item
+
+    def front_swap(self, dist: int) -> None:
+        """ Swaps the front item with the item at a given distance, wrapping around.
+        :complexity: O(1)
+        """
+        if self.length == 0:
+            return
+        other = dist % self.length
+        temp = self[0]
+        self[0] = self[other]
+        self[other] = temp
+
+    def _reverse(self, start: int, end: int) -> None:
+        """ Reverses the items from index start up to (not including) end, in place. """
+        end -= 1
+        while start < end:
+            temp = self[start]
+            self[start] = self[end]
+            self[end] = temp
+            start += 1
+            end -= 1
+
+    def flip_halves(self) -> None:
+        """ Moves the back half, reversed, in front of the front half (as MonsterList.flip_halves).
+        :complexity: O(n) where n is the length of the deque, with O(1) extra space
+        """
+        front_len = self.length // 2
+        self._reverse(0, self.length)
+        self._reverse(self.length - front_len, self.length)
+
+    def __str__(self) -> str:
+        """ String representation of the items from front to rear. """
+        return "[" + ", ".join(str(self[i]) for i in range(self.length)) + "]"
+
+
 class TestQueue(unittest.TestCase):
     """ Tests for the above class."""
     EMPTY = 0
@@ -308,6 +515,102 @@ class TestQueue(unittest.TestCase):
         self.assertEqual(queue.serve(), 1)
 
 
+    def test_export_and_iter(self):
+        queue = CircularMonsterQueue(4)
+        for i in range(4):
+            queue.append(i)
+        queue.serve()
+        queue.serve()
+        queue.append(4)
+        queue.append(None)
+        # Wrapped around the end of the array.
+        self.assertEqual(queue.export().to_list(), [2, 3, 4, None])
+        self.assertEqual(list(queue), [2, 3, 4, None])
+        self.assertEqual(list(CircularMonsterQueue(3)), [])
+        self.assertEqual(len(CircularMonsterQueue(3).export()), 0)
+
+
+class TestGrowableQueue(unittest.TestCase):
+    """ Tests for GrowableMonsterQueue."""
+
+    def test_grow_and_shrink(self):
+        queue = GrowableMonsterQueue(2)
+        queue.append(-1)
+        queue.serve()
+        # Wrapped around before growing, so growing has to unwrap.
+        for i in range(100):
+            queue.append(i)
+        self.assertFalse(queue.is_full())
+        self.assertEqual(len(queue.array), 128)
+        self.assertEqual(list(queue), list(range(100)))
+        for i in range(97):
+            self.assertEqual(queue.serve(), i)
+        self.assertEqual(list(queue), [97, 98, 99])
+        self.assertLessEqual(len(queue.array), 16)
+        for i in range(3):
+            queue.serve()
+        # Never below the initial capacity.
+        self.assertEqual(len(queue.array), 2)
+        self.assertTrue(queue.is_empty())
+        self.assertRaises(Exception, queue.serve)
+
+    def test_interleaved(self):
+        queue = GrowableMonsterQueue()
+        expected = []
+        for i in range(200):
+            queue.append(i)
+            expected.append(i)
+            if i % 3 == 0:
+                self.assertEqual(queue.serve(), expected.pop(0))
+        self.assertEqual(queue.export().to_list(), expected)
+        queue.clear()
+        self.assertEqual(len(queue.array), 1)
+
+
+class TestDeque(unittest.TestCase):
+    """ Tests for CircularMonsterDeque."""
+
+    def contents(self, deque):
+        return [deque[i] for i in range(len(deque))]
+
+    def test_both_ends(self):
+        deque = CircularMonsterDeque(2)
+        for i in range(5):
+            deque.append(i)
+            deque.prepend(-i - 1)
+        self.assertEqual(self.contents(deque), [-5, -4, -3, -2, -1, 0, 1, 2, 3, 4])
+        self.assertEqual(deque[-1], 4)
+        self.assertEqual(deque.serve(), -5)
+        self.assertEqual(deque.pop(), 4)
+        self.assertEqual(len(deque), 8)
+        self.assertRaises(IndexError, lambda: deque[8])
+
+    def test_insert_and_delete(self):
+        deque = CircularMonsterDeque(3)
+        for i in range(6):
+            deque.append(i)
+        deque.insert(1, 10)
+        deque.insert(5, 11)
+        self.assertEqual(self.contents(deque), [0, 10, 1, 2, 3, 11, 4, 5])
+        self.assertEqual(deque.delete_at_index(1), 10)
+        self.assertEqual(deque.delete_at_index(4), 11)
+        self.assertEqual(deque.delete_at_index(0), 0)
+        self.assertEqual(self.contents(deque), [1, 2, 3, 4, 5])
+        self.assertRaises(ValueError, lambda: deque.delete_at_index(5))
+
+    def test_specials(self):
+        deque = CircularMonsterDeque(5)
+        deque.append(1)
+        for i in range(2, 6):
+            deque.append(i)
+        deque.serve()
+        deque.append(6)
+        # Wrapped around: [2, 3, 4, 5, 6]
+        deque.flip_halves()
+        self.assertEqual(self.contents(deque), [6, 5, 4, 2, 3])
+        deque.front_swap(2)
+        self.assertEqual(self.contents(deque), [4, 5, 6, 2, 3])
+
 
 if __name__ == '__main__':
     testtorun = TestQueue()
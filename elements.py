@@ -1,12 +1,14 @@
 from __future__ import annotations
-import math
 
+import os
+from array import array
 from enum import auto
 from typing import Optional
 
 from base_enum import BaseEnum
 
 from data_structures.referential_array import ArrayR
+from snapshot import load_with_snapshot
 
 class Element(BaseEnum):
     """
@@ -42,25 +44,51 @@ class Element(BaseEnum):
 
     @classmethod
     def from_string(cls, string: str) -> Element:
-        for elem in Element:
-            if elem.name.lower() == string.lower():
-                return elem
-        raise ValueError(f"Unexpected string {string}")
+        """
+        Case-insensitive lookup of an element by name.
+
+        :raises ValueError: if no element has that name.
+        :complexity: O(1), a single lookup in the table built below the class.
+        """
+        try:
+            return Element._by_name[string.lower()]
+        except KeyError:
+            raise ValueError(f"Unexpected string {string}") from None
+
+# Built once the enum members exist; enum class bodies can't hold non-member tables.
+Element._by_name = {elem.name.lower(): elem for elem in Element}
+
+# Default for EffectivenessCalculator.configure arguments that keep their current setting.
+_UNSET = object()
 
 class EffectivenessCalculator:
     """
     Helper class for calculating the element effectiveness for two elements.
 
-    This class follows the singleton pattern.
+    This class follows the singleton pattern. The singleton is loaded from csv_file
+    on first use, not at import, so importing battle code does no file I/O.
 
     Usage:
         EffectivenessCalculator.get_effectiveness(elem1, elem2)
+        EffectivenessCalculator.configure(csv_file="my_table.csv")  # use another table
     """
 
     instance: Optional[EffectivenessCalculator] = None
+    # Where the singleton is loaded from. Defaults can be set with the TYPE_EFFECTIVENESS_CSV and
+    # TYPE_EFFECTIVENESS_CACHE environment variables, or changed with configure().
+    # cache_file, if set, holds a parsed copy of the csv (see snapshot.py).
+    csv_file: str = os.environ.get("TYPE_EFFECTIVENESS_CSV", "type_effectiveness.csv")
+    cache_file: Optional[str] = os.environ.get("TYPE_EFFECTIVENESS_CACHE") or None
     element_names = None
     effectiveness_values = None
 
+    # Lookup tables built once in __init__.
+    # _positions maps Element.value to the row/column of that element (-1 if absent),
+    # _matrix is the flattened n*n table of effectiveness values.
+    _n: int = 0
+    _positions: array = None
+    _matrix: array = None
+
     def __init__(self, element_names: ArrayR[str], effectiveness_values: ArrayR[float]) -> None:
         """
         Initialise the Effectiveness Calculator.
@@ -78,8 +106,21 @@ class EffectivenessCalculator:
         Water is double effective to Fire, and half effective to Water and Grass [2, 0.5, 0.5]
         Grass is half effective to Fire and Grass, and double effective to Water [0.5, 2, 0.5]
         """
+        n = len(element_names)
+        if len(effectiveness_values) != n * n:
+            raise ValueError(f"Expected {n*n} effectiveness values for {n} elements, got {len(effectiveness_values)}")
+
+        positions = array("i", [-1] * (max(elem.value for elem in Element) + 1))
+        for i in range(n):
+            positions[Element.from_string(element_names[i]).value] = i
+
         EffectivenessCalculator.element_names = element_names
         EffectivenessCalculator.effectiveness_values = effectiveness_values
+        EffectivenessCalculator._n = n
+        EffectivenessCalculator._positions = positions
+        EffectivenessCalculator._matrix = array("d", [effectiveness_values[i] for i in range(n * n)])
+        # The tables are shared, so the latest calculator is the one in use.
+        EffectivenessCalculator.instance = self
 
     @classmethod
     def get_effectiveness(cls, type1: Element, type2: Element) -> float:
@@ -87,39 +128,65 @@ class EffectivenessCalculator:
         Returns the effectivness of elem1 attacking elem2.
 
         Example: EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.WATER) == 0.5
-        """
 
-        n = int(math.sqrt(len(EffectivenessCalculator.effectiveness_values)))
+        :raises ValueError: if either element is not in the loaded table.
+        :complexity: O(1), after the table is loaded on the first call
+        """
+        if EffectivenessCalculator.instance is None:
+            EffectivenessCalculator.make_singleton()
+        index_attacking = EffectivenessCalculator._positions[type1.value]
+        index_defending = EffectivenessCalculator._positions[type2.value]
+        if index_attacking < 0 or index_defending < 0:
+            raise ValueError(f"No effectiveness data for {type1} against {type2}")
+        return EffectivenessCalculator._matrix[EffectivenessCalculator._n*index_attacking+index_defending]
 
-        for i in range(len(EffectivenessCalculator.element_names)):
-            if Element.from_string(EffectivenessCalculator.element_names[i]) == type1:
-                index_attacking = i
-            if Element.from_string(EffectivenessCalculator.element_names[i]) == type2:
-                index_defending = i
-        return EffectivenessCalculator.effectiveness_values[n*index_attacking+index_defending]
 
+    @staticmethod
+    def _parse_csv(raw: bytes) -> tuple[list[str], list[float]]:
+        header, *rows = raw.decode().strip().splitlines()
+        return header.split(","), [float(value) for value in ",".join(rows).split(",")]
 
     @classmethod
-    def from_csv(cls, csv_file: str) -> EffectivenessCalculator:
-        # NOTE: This is a terrible way to open csv files, if writing your own code use the `csv` module.
-        # This is done this way to facilitate the second half of the task, the __init__ definition.
-        with open(csv_file, "r") as file:
-            header, rest = file.read().strip().split("\n", maxsplit=1)
-            header = header.split(",")
-            rest = rest.replace("\n", ",").split(",")
-            a_header = ArrayR(len(header))
-            a_all = ArrayR(len(rest))
-            for i in range(len(header)):
-                a_header[i] = header[i]
-            for i in range(len(rest)):
-                a_all[i] = float(rest[i])
-            return EffectivenessCalculator(a_header, a_all)
+    def from_csv(cls, csv_file: str, cache_file: Optional[str] = None) -> EffectivenessCalculator:
+        """
+        Builds a calculator from a csv file, using the parsed copy in cache_file when it is up to date.
+        """
+        header, values = load_with_snapshot(csv_file, cache_file, cls._parse_csv)
+        return EffectivenessCalculator(ArrayR.from_list(header), ArrayR.from_list(values))
 
     @classmethod
     def make_singleton(cls):
-        cls.instance = EffectivenessCalculator.from_csv("type_effectiveness.csv")
+        cls.instance = EffectivenessCalculator.from_csv(cls.csv_file, cls.cache_file)
+
+    @classmethod
+    def get_instance(cls) -> EffectivenessCalculator:
+        """Returns the singleton, loading it first if needed."""
+        if cls.instance is None:
+            cls.make_singleton()
+        return cls.instance
+
+    @classmethod
+    def get_table(cls) -> tuple[int, array, array]:
+        """
+        Returns (n, positions, matrix), loading the singleton first if needed.
+        positions maps Element.value to its row/column (-1 if absent), and matrix is the
+        flattened n*n table, one row per attacking element. The arrays are shared, so don't modify them.
+        """
+        cls.get_instance()
+        return EffectivenessCalculator._n, EffectivenessCalculator._positions, EffectivenessCalculator._matrix
 
-EffectivenessCalculator.make_singleton()
+    @classmethod
+    def configure(cls, csv_file: Optional[str] = None, cache_file: Optional[str] = _UNSET) -> None:
+        """
+        Sets the csv file and/or the cache file to load the table from. Arguments left out
+        keep their current setting; cache_file=None turns the cache off.
+        The table is reloaded on next use.
+        """
+        if csv_file is not None:
+            cls.csv_file = csv_file
+        if cache_file is not _UNSET:
+            cls.cache_file = cache_file
+        cls.instance = None
 
 
 if __name__ == "__main__":
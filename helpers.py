@@ -1,39 +1,141 @@
 from __future__ import annotations
-import yaml
-from typing import TYPE_CHECKING
+from bisect import bisect_left, bisect_right
+from typing import Optional, TYPE_CHECKING
 
 from data_structures.referential_array import ArrayR
+from snapshot import load_with_snapshot
 
 if TYPE_CHECKING:
+    from elements import Element
     from monster_base import MonsterBase
 
 
 _monsters: ArrayR[MonsterBase] = None
+# Names of the monsters in the data file, so lookups of other names need not make the catalog.
+_monster_names: frozenset[str] = None
+# Immutable indexes of the spawnable monsters, built with the catalog (see _build_spawn_indexes).
+_spawnable: tuple[type[MonsterBase], ...] = None
+_spawnable_by_element: dict[int, tuple[type[MonsterBase], ...]] = None
+_spawnable_by_stat: dict[str, tuple[tuple, tuple[type[MonsterBase], ...]]] = None
+
+SPAWN_STATS = ("attack", "defense", "speed", "max_hp")
+
+MONSTERS_FILE = "monsters.yaml"
+# Parsed monsters.yaml, saved with marshal so later starts skip the YAML parse.
+SNAPSHOT_FILE = "monsters.yaml.snapshot"
 
 
 def MonsterBaseFactory(name, description, evolution, element, simple_stats, complex_stats, can_be_spawned) -> type[MonsterBase]:
     from monster_base import MonsterBase
+    from elements import Element
+    # Parsed once here so battles never re-parse the element string.
+    element_type = Element.from_string(element)
     return type(name, (MonsterBase, ), {
+        "__slots__": (),
+        # type() would otherwise record the module as abc (via ABCMeta); this makes
+        # classes and instances picklable, e.g. for process pools.
+        "__module__": __name__,
         "get_name": classmethod(lambda s: name),
         "get_description": classmethod(lambda s: description),
         # This will be defined later when we have all names.
         "get_evolution": classmethod(lambda s: None),
         "get_element": classmethod(lambda s: element),
+        "get_element_type": classmethod(lambda s: element_type),
         "get_simple_stats": classmethod(lambda s: simple_stats),
         "get_complex_stats": classmethod(lambda s: complex_stats),
         "can_be_spawned": classmethod(lambda s: can_be_spawned),
     })
 
 def get_all_monsters():
+    """
+    Returns every monster class, making them on first use.
+    The classes are also available as module attributes, e.g. helpers.Flamikin.
+    """
     if _monsters is None:
         _make_all_monster_classes()
     return _monsters
 
+def get_spawnable_monsters() -> tuple[type[MonsterBase], ...]:
+    """
+    Returns the monster classes that can be spawned, in catalog order.
+    :complexity: O(1) once the catalog is made
+    """
+    if _monsters is None:
+        _make_all_monster_classes()
+    return _spawnable
+
+def get_spawnable_by_element(element: Element) -> tuple[type[MonsterBase], ...]:
+    """
+    Returns the spawnable monster classes of an element, in catalog order.
+    :complexity: O(1) once the catalog is made
+    """
+    if _monsters is None:
+        _make_all_monster_classes()
+    return _spawnable_by_element.get(element.value, ())
+
+def get_spawnable_by_stat(stat: str, lo, hi) -> tuple[type[MonsterBase], ...]:
+    """
+    Returns the spawnable monster classes whose simple `stat` (one of SPAWN_STATS)
+    is between lo and hi inclusive, ordered by that stat (ties in catalog order).
+    :raises ValueError: if stat is not one of SPAWN_STATS
+    :complexity: O(log n + k) where n is the number of spawnable classes and k the number returned
+    """
+    if stat not in SPAWN_STATS:
+        raise ValueError(f"stat must be one of {SPAWN_STATS}, got {stat!r}")
+    if _monsters is None:
+        _make_all_monster_classes()
+    values, classes = _spawnable_by_stat[stat]
+    return classes[bisect_left(values, lo):bisect_right(values, hi)]
+
+def __getattr__(name):
+    # Monster classes are only made when first needed, so `from helpers import Flamikin`
+    # and unpickling a monster both end up here before the catalog exists.
+    if _monsters is None and not name.startswith("__") and name in _get_monster_names():
+        _make_all_monster_classes()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _get_monster_names() -> frozenset[str]:
+    """
+    Returns the names of the monsters in the data file, reading only the data
+    (not making the classes) the first time.
+    """
+    global _monster_names
+    if _monster_names is None:
+        _monster_names = frozenset(monster["name"] for monster in load_monster_data())
+    return _monster_names
+
+def load_monster_data(path: str = MONSTERS_FILE, snapshot_path: Optional[str] = SNAPSHOT_FILE) -> list[dict]:
+    """
+    Returns the parsed contents of the monsters YAML file, using the snapshot at
+    snapshot_path when it is up to date (see snapshot.load_with_snapshot).
+    """
+    def parse(raw: bytes) -> list[dict]:
+        import yaml
+        return yaml.safe_load(raw)
+    return load_with_snapshot(path, snapshot_path, parse)
+
+def _build_spawn_indexes() -> None:
+    global _spawnable, _spawnable_by_element, _spawnable_by_stat
+    spawnable = tuple(_monsters[i] for i in range(len(_monsters)) if _monsters[i].can_be_spawned())
+    by_element = {}
+    for monster in spawnable:
+        by_element.setdefault(monster.get_element_type().value, []).append(monster)
+    by_stat = {}
+    for stat in SPAWN_STATS:
+        # sorted is stable, so ties stay in catalog order.
+        ordered = sorted(spawnable, key=lambda m: getattr(m.get_simple_stats(), f"get_{stat}")())
+        values = tuple(getattr(m.get_simple_stats(), f"get_{stat}")() for m in ordered)
+        by_stat[stat] = (values, tuple(ordered))
+    _spawnable = spawnable
+    _spawnable_by_element = {value: tuple(monsters) for value, monsters in by_element.items()}
+    _spawnable_by_stat = by_stat
+
 def _make_all_monster_classes():
     from stats import SimpleStats, ComplexStats
-    global _monsters
-    with open("monsters.yaml", "r") as f:
-        monsters_yaml = yaml.safe_load(f)
+    global _monsters, _monster_names
+    monsters_yaml = load_monster_data()
+    _monster_names = frozenset(monster["name"] for monster in monsters_yaml)
     _monsters = ArrayR(len(monsters_yaml))
     idx = 0
     for monster in monsters_yaml:
@@ -64,8 +166,7 @@ def _make_all_monster_classes():
         evolution_class = globals()[evolution]
         globals()[monster["name"]].evolution_class = evolution_class
         globals()[monster["name"]].get_evolution = classmethod(lambda s: s.evolution_class)
-
-get_all_monsters()
+    _build_spawn_indexes()
 
 if TYPE_CHECKING:
     # Makes no sense but fixes the red squigglies
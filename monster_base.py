@@ -6,6 +6,14 @@ from elements import EffectivenessCalculator, Element
 
 class MonsterBase(abc.ABC):
 
+    # Fixed instance layout: no per-instance __dict__. Subclasses made by
+    # helpers.MonsterBaseFactory declare empty __slots__ to keep it that way.
+    __slots__ = ("_level", "leveled_up", "stats", "hp")
+
+    # The MonsterRoster holding this monster's state, if any. Ordinary instances hold their own
+    # state; roster.MonsterView sets it per view, and MonsterTeam uses it to heal a team at once.
+    roster = None
+
     def __init__(self, simple_mode=True, level:int=1) -> None:
         """
         Initialise an instance of a monster.
@@ -23,7 +31,7 @@ class MonsterBase(abc.ABC):
         else:
             self.stats = self.get_complex_stats()
         
-        self.hp = self.stats.get_max_hp()
+        self.hp = self.stats.get_max_hp(self._level)
 
 
     def get_level(self):
@@ -63,19 +71,19 @@ class MonsterBase(abc.ABC):
 
     def get_attack(self):
         """Get the attack of this monster instance"""
-        return self.stats.get_attack()
+        return self.stats.get_attack(self.get_level())
 
     def get_defense(self):
         """Get the defense of this monster instance"""
-        return self.stats.get_defense()
+        return self.stats.get_defense(self.get_level())
 
     def get_speed(self):
         """Get the speed of this monster instance"""
-        return self.stats.get_speed()
+        return self.stats.get_speed(self.get_level())
 
     def get_max_hp(self):
         """Get the maximum HP of this monster instance"""
-        return self.stats.get_max_hp()
+        return self.stats.get_max_hp(self.get_level())
 
     def alive(self) -> bool:
         """Whether the current monster instance is alive (HP > 0 )"""
@@ -101,7 +109,7 @@ class MonsterBase(abc.ABC):
                 damage = attack / 4
         
             #step 2
-            elemental_multiplier = EffectivenessCalculator.get_effectiveness(Element.from_string(self.get_element()), Element.from_string(other.get_element()))
+            elemental_multiplier = EffectivenessCalculator.get_effectiveness(self.get_element_type(), other.get_element_type())
             effective_damage = damage*elemental_multiplier
 
             final_damage = int(effective_damage)+1
@@ -168,6 +176,21 @@ class MonsterBase(abc.ABC):
         """
         pass
 
+    @classmethod
+    def get_element_type(cls) -> Element:
+        """
+        Returns the element of the Monster as an Element.
+        Same for all monsters of the same type, so get_element() is parsed on the first call
+        and kept on the class. The helpers factory overrides this with the element it parsed.
+        :complexity: O(1)
+        """
+        # Looked up in the class's own __dict__, so a subclass never reuses its parent's element.
+        element_type = cls.__dict__.get("_element_type")
+        if element_type is None:
+            element_type = Element.from_string(cls.get_element())
+            cls._element_type = element_type
+        return element_type
+
     @classmethod
     @abc.abstractmethod
     def can_be_spawned(cls) -> bool:
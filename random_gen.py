@@ -4,6 +4,22 @@ Random number generator class. Uses LCG method with some reasonable initialisati
 __author__ = "Jackson Goerner"
 
 import time
+from types import MethodType
+
+
+class generatormethod:
+    """
+    Method decorator like classmethod, except that when looked up on an instance
+    the function is bound to the instance, so it acts on the instance's own state.
+    """
+
+    def __init__(self, func) -> None:
+        self.__func__ = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, objtype=None):
+        return MethodType(self.__func__, objtype if obj is None else obj)
+
 
 class RandomGen():
     """
@@ -11,12 +27,19 @@ class RandomGen():
 
     Uses LCG method. All methods are O(1) best/worst case time complexity unless stated otherwise.
 
+    Methods can be called on the class, which is the shared default generator
+    (its state is the class attribute `seed`), or on RandomGen instances, each with its own state.
+
     Usage:
     ```
     RandomGen.set_seed(123)
     RandomGen.random()           # Random number from 0 to 2^32-1
     RandomGen.randint(1, 10)     # Random number from 1 to 10
     RandomGen.random_chance(0.33) # True 33% of the time, False 67% of the time.
+
+    gen = RandomGen(123)         # Independent generator, same sequence as above
+    gen.jump(10**9)              # Skip 10^9 numbers in O(log 10^9)
+    streams = gen.spawn(4)       # 4 generators drawing from non-overlapping parts of gen's sequence
     ```
     """
 
@@ -24,48 +47,168 @@ class RandomGen():
     A = 25214903917
     C = 11
 
+    # Numbers each generator made by spawn can draw before reaching the next one's start.
+    SPAWN_STRIDE = pow(2, 36)
+
     seed = time.time_ns()
 
-    @classmethod
+    # Largest batch computed in one go by random_batch; longer batches are done in chunks.
+    BATCH_CHUNK = pow(2, 16)
+
+    # Multipliers and increments taking a state i+1 steps ahead, for i < len; see _step_table.
+    _step_mul = None
+    _step_add = None
+
+    def __init__(self, seed=None) -> None:
+        """Makes a generator with its own state, seeded like `set_seed`."""
+        self.set_seed(seed)
+
+    @generatormethod
     def set_seed(cls, seed=None):
         """Seed all future calls to `random`."""
         seed = time.time_ns() if seed is None else seed
         cls.seed = seed
 
-    @classmethod
+    @generatormethod
     def random(cls):
         """Returns a random integer from 0 to 2^32-1"""
         cls.seed = (cls.A * cls.seed + cls.C) % cls.MOD
         return cls.seed >> 16
 
-    @classmethod
+    @generatormethod
     def random_float(cls):
         """Returns a random floating point integer in the range 0 to 1."""
         return cls.random() / (1 << 32)
 
-    @classmethod
+    @generatormethod
     def randint(cls, lo, hi):
         """Returns a random integer from `lo` to `hi` inclusive on both ends."""
         return (cls.random() % (hi - lo + 1)) + lo
 
-    @classmethod
+    @generatormethod
     def random_chance(cls, ratio):
         """Returns random()/2^32 < ratio"""
         return cls.random_float() < ratio
 
-    @classmethod
+    @generatormethod
     def random_choice(cls, collection) -> None:
         """Returns a random choice from a collection that supports __getitem__ and __len__"""
         return collection[cls.randint(0, len(collection)-1)]
 
-    @classmethod
-    def random_shuffle(cls, collection) -> None:
+    @generatormethod
+    def random_shuffle(cls, collection, compatible: bool = True) -> None:
         """
         Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__
-        :complexity: O(len(collection))
+
+        compatible=True (the default) gives the same permutation for a given seed as always:
+        items are ordered by one random() key each, ties by position. This needs O(n) extra memory.
+        compatible=False does a Fisher-Yates shuffle by swapping items in place, with O(1)
+        extra memory; it gives a different permutation and uses n-1 random numbers.
+        :complexity: O(len(collection) log(len(collection))) if compatible, else O(len(collection))
         """
-        positions = [(RandomGen.random(), i) for i in range(len(collection))]
-        positions.sort() # I can use inbuilt list sorting here - YOU CANNOT ANYWHERE ELSE! >:D
-        tmp = [collection[p[1]] for p in positions]
-        for x in range(len(collection)):
+        n = len(collection)
+        if not compatible:
+            for i in range(n - 1, 0, -1):
+                j = cls.randint(0, i)
+                if i != j:
+                    temp = collection[i]
+                    collection[i] = collection[j]
+                    collection[j] = temp
+            return
+        keys = [cls.random() for _ in range(n)]
+        # Stable, so equal keys stay in position order, as when sorting (key, position) pairs.
+        order = sorted(range(n), key=keys.__getitem__) # I can use inbuilt list sorting here - YOU CANNOT ANYWHERE ELSE! >:D
+        tmp = [collection[i] for i in order]
+        for x in range(n):
             collection[x] = tmp[x]
+
+    @generatormethod
+    def jump(cls, k: int) -> None:
+        """
+        Advances the state as if `random` had been called k times.
+        The LCG step is the affine map x -> A*x + C, so k steps are its k-th power,
+        found by repeated squaring.
+        :complexity: O(log k)
+        """
+        if k < 0:
+            raise ValueError("Can only jump forwards")
+        mul, add = 1, 0
+        step_mul, step_add = cls.A, cls.C
+        while k > 0:
+            if k & 1:
+                mul, add = (mul * step_mul) % cls.MOD, (add * step_mul + step_add) % cls.MOD
+            step_mul, step_add = (step_mul * step_mul) % cls.MOD, (step_add * (step_mul + 1)) % cls.MOD
+            k >>= 1
+        cls.seed = (mul * cls.seed + add) % cls.MOD
+
+    @generatormethod
+    def spawn(cls, n: int, stride: int = None) -> list:
+        """
+        Returns n new generators for the next n blocks of `stride` numbers of this generator's
+        sequence, and moves this generator past them. The streams don't overlap as long as
+        each generator draws fewer than `stride` numbers (SPAWN_STRIDE by default).
+        The result depends only on this generator's state, so it is reproducible.
+        :raises ValueError: if the blocks would wrap around the whole sequence.
+        :complexity: O(n log(stride))
+        """
+        stride = cls.SPAWN_STRIDE if stride is None else stride
+        if stride <= 0 or n * stride >= cls.MOD:
+            raise ValueError(f"Cannot fit {n} streams of {stride} numbers in the generator's period")
+        streams = []
+        for _ in range(n):
+            stream = RandomGen(cls.seed)
+            streams.append(stream)
+            cls.jump(stride)
+        return streams
+
+    @staticmethod
+    def _step_table(n: int):
+        """
+        Returns uint64 arrays (mul, add) of length >= n such that i+1 calls to `random`
+        take state x to (mul[i]*x + add[i]) mod MOD.
+        The table is built by doubling and kept for later calls.
+        :complexity: O(n) the first time n is reached, then O(1)
+        """
+        import numpy as np
+        if RandomGen._step_mul is None or len(RandomGen._step_mul) < n:
+            # uint64 arithmetic wraps mod 2^64, which MOD = 2^48 divides, so results
+            # are exact once masked to 48 bits.
+            mul = np.array([RandomGen.A], dtype=np.uint64)
+            add = np.array([RandomGen.C], dtype=np.uint64)
+            while len(mul) < n:
+                # Steps m+1..2m are steps 1..m followed by m more steps.
+                last_mul, last_add = mul[-1], add[-1]
+                mul, add = np.concatenate((mul, mul * last_mul)), np.concatenate((add, add * last_mul + last_add))
+            mask = np.uint64(RandomGen.MOD - 1)
+            RandomGen._step_mul, RandomGen._step_add = mul & mask, add & mask
+        return RandomGen._step_mul, RandomGen._step_add
+
+    @generatormethod
+    def random_batch(cls, n: int):
+        """
+        Returns a NumPy uint64 array of the next n numbers `random` would return, in order,
+        and advances the state past them.
+        :complexity: O(n), as a few array operations per BATCH_CHUNK numbers
+        """
+        import numpy as np
+        out = np.empty(max(0, n), dtype=np.uint64)
+        mul, add = RandomGen._step_table(min(n, cls.BATCH_CHUNK))
+        mask = np.uint64(cls.MOD - 1)
+        state = cls.seed % cls.MOD
+        for start in range(0, n, cls.BATCH_CHUNK):
+            size = min(cls.BATCH_CHUNK, n - start)
+            states = (mul[:size] * np.uint64(state) + add[:size]) & mask
+            out[start:start + size] = states >> np.uint64(16)
+            state = int(states[-1])
+        if n > 0:
+            cls.seed = state
+        return out
+
+    @generatormethod
+    def randint_batch(cls, lo: int, hi: int, n: int):
+        """
+        Returns a NumPy int64 array of the next n numbers `randint(lo, hi)` would return, in order.
+        :complexity: O(n), as a few array operations
+        """
+        import numpy as np
+        return (cls.random_batch(n) % np.uint64(hi - lo + 1)).astype(np.int64) + lo
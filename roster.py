@@ -0,0 +1,289 @@
+"""
+Struct-of-arrays storage for large populations of monsters.
+
+A MonsterRoster keeps each monster's class id, level, hp and leveled_up flag
+in parallel NumPy arrays instead of one MonsterBase object per monster.
+`roster[i]` returns a MonsterView, a small handle with the MonsterBase
+instance API (get_hp, attack, alive, ...) that Battle and MonsterTeam use.
+
+Usage:
+```
+roster = MonsterRoster()
+flamikin = roster.spawn(Flamikin)      # MonsterView
+roster.spawn_many(class_ids, levels)   # bulk creation
+roster.regenerate()                    # heal everyone in one vectorised fill
+```
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from elements import Element
+from helpers import get_all_monsters
+from monster_base import MonsterBase
+from stats import Stats
+
+
+class MonsterRoster:
+    """
+    Parallel arrays of monster state. All monsters in a roster use simple or complex
+    stats, as chosen when the roster is made. Only classes from helpers.get_all_monsters()
+    can be stored, identified by their index in it.
+
+    Attributes:
+        length (int): number of monsters in the roster
+        class_id (np.ndarray[int16]): index of each monster's class in get_all_monsters()
+        level (np.ndarray[int16]): level of each monster
+        hp (np.ndarray[int32]): current hp of each monster
+        leveled_up (np.ndarray[bool]): whether each monster has levelled up (see MonsterBase)
+    """
+
+    MIN_CAPACITY = 1
+
+    def __init__(self, simple_mode: bool = True, capacity: int = 1) -> None:
+        """
+        :complexity: O(capacity + m) where m is the number of monster classes
+        """
+        self.simple_mode = simple_mode
+        self.length = 0
+        capacity = max(self.MIN_CAPACITY, capacity)
+        self.class_id = np.zeros(capacity, dtype=np.int16)
+        self.level = np.zeros(capacity, dtype=np.int16)
+        self.hp = np.zeros(capacity, dtype=np.int32)
+        self.leveled_up = np.zeros(capacity, dtype=bool)
+
+        monsters = get_all_monsters()
+        self.classes = monsters
+        self._class_ids = {}
+        for i in range(len(monsters)):
+            self._class_ids[monsters[i]] = i
+        # Simple stats don't depend on level, so max hp is one value per class, looked up by class id.
+        self._simple_max_hp = None
+        if simple_mode:
+            self._simple_max_hp = np.array([self.stats_of(c).get_max_hp() for c in range(len(monsters))], dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> MonsterView:
+        """
+        Returns a view of the monster at a given index.
+        :raises IndexError: if the index is out of range
+        :complexity: O(1)
+        """
+        if index < 0 or index >= self.length:
+            raise IndexError("roster index out of range")
+        return MonsterView(self, index)
+
+    def class_id_of(self, monster_cls: type[MonsterBase]) -> int:
+        """
+        Returns the class id of a monster class.
+        :raises ValueError: if the class is not one of helpers.get_all_monsters()
+        :complexity: O(1)
+        """
+        try:
+            return self._class_ids[monster_cls]
+        except KeyError:
+            raise ValueError(f"{monster_cls} is not a monster from helpers.get_all_monsters()") from None
+
+    def stats_of(self, class_id: int) -> Stats:
+        """Returns the stats object monsters of a class use in this roster."""
+        monster_cls = self.classes[class_id]
+        return monster_cls.get_simple_stats() if self.simple_mode else monster_cls.get_complex_stats()
+
+    def _reserve(self, extra: int) -> None:
+        """
+        Makes room for `extra` more monsters, doubling the arrays as needed.
+        :complexity: O(n) when the arrays grow, otherwise O(1)
+        """
+        needed = self.length + extra
+        capacity = len(self.class_id)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("class_id", "level", "hp", "leveled_up"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.length] = old[:self.length]
+            setattr(self, name, new)
+
+    def spawn(self, monster_cls: type[MonsterBase], level: int = 1) -> MonsterView:
+        """
+        Adds a monster at full health, like monster_cls(simple_mode, level).
+        :complexity: O(1) amortized
+        """
+        class_id = self.class_id_of(monster_cls)
+        self._reserve(1)
+        index = self.length
+        self.class_id[index] = class_id
+        self.level[index] = level
+        self.leveled_up[index] = False
+        self.hp[index] = self.stats_of(class_id).get_max_hp(level)
+        self.length += 1
+        return MonsterView(self, index)
+
+    def spawn_many(self, class_ids, levels=1) -> range:
+        """
+        Adds one monster per class id, all at full health.
+        `levels` is either one level for every monster or one level per monster.
+        :returns: the range of indices of the new monsters
+        :complexity: O(k + d) amortized where k is the number of monsters added,
+            and d the number of distinct (class, level) pairs among them
+        """
+        class_ids = np.asarray(class_ids, dtype=np.int16)
+        k = len(class_ids)
+        if k and (class_ids.min() < 0 or class_ids.max() >= len(self.classes)):
+            raise ValueError("class ids must index helpers.get_all_monsters()")
+        self._reserve(k)
+        start = self.length
+        new = slice(start, start + k)
+        self.class_id[new] = class_ids
+        self.level[new] = levels
+        self.leveled_up[new] = False
+        self.length += k
+        self.regenerate(np.arange(start, start + k))
+        return range(start, start + k)
+
+    def max_hp(self, indices=None) -> np.ndarray:
+        """
+        Returns the max hp of the monsters at `indices` (every monster by default).
+        In simple mode it is looked up in a per-class table made in __init__; in complex mode
+        it is computed once per distinct (class, level) pair.
+        :complexity: O(k) in simple mode, O(k log k + d) in complex mode, where k is the number
+            of indices and d the number of distinct pairs
+        """
+        if indices is None:
+            indices = slice(0, self.length)
+        class_id = self.class_id[indices]
+        if self.simple_mode:
+            return self._simple_max_hp[class_id]
+        level = self.level[indices]
+        pairs, inverse = np.unique(np.stack([class_id.astype(np.int64), level]), axis=1, return_inverse=True)
+        table = np.array([self.stats_of(c).get_max_hp(l) for c, l in pairs.T], dtype=np.int32)
+        return table[inverse.reshape(-1)]
+
+    def regenerate(self, indices=None) -> None:
+        """
+        Brings the monsters at `indices` (every monster by default) back to full health,
+        as MonsterTeam.regenerate_team does, with one array fill.
+        :complexity: as max_hp
+        """
+        if indices is None:
+            indices = slice(0, self.length)
+        self.hp[indices] = self.max_hp(indices)
+
+    def alive(self) -> np.ndarray:
+        """Returns a boolean array of which monsters are alive."""
+        return self.hp[:self.length] > 0
+
+    def nbytes(self) -> int:
+        """Returns the bytes used by the per-monster arrays (including spare capacity)."""
+        return self.class_id.nbytes + self.level.nbytes + self.hp.nbytes + self.leveled_up.nbytes
+
+
+class MonsterView:
+    """
+    Handle to one monster in a MonsterRoster, with the same instance API as MonsterBase.
+
+    Views are created on demand; two views of the same roster slot compare equal.
+    Evolving a view changes the class of its slot in place.
+
+    `roster` is part of the monster API (see MonsterBase.roster): it is how MonsterTeam
+    recognises a team of views of one roster and heals it with MonsterRoster.regenerate.
+    """
+
+    __slots__ = ("roster", "index")
+
+    def __init__(self, roster: MonsterRoster, index: int) -> None:
+        self.roster = roster
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, MonsterView) and self.roster is other.roster and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.roster), self.index))
+
+    def monster_class(self) -> type[MonsterBase]:
+        return self.roster.classes[int(self.roster.class_id[self.index])]
+
+    def _stats(self) -> Stats:
+        return self.roster.stats_of(int(self.roster.class_id[self.index]))
+
+    @property
+    def hp(self) -> int:
+        return int(self.roster.hp[self.index])
+
+    @hp.setter
+    def hp(self, value: int) -> None:
+        self.roster.hp[self.index] = value
+
+    @property
+    def leveled_up(self) -> bool:
+        return bool(self.roster.leveled_up[self.index])
+
+    @leveled_up.setter
+    def leveled_up(self, value: bool) -> None:
+        self.roster.leveled_up[self.index] = value
+
+    def get_level(self):
+        return int(self.roster.level[self.index])
+
+    def level_up(self):
+        self.roster.level[self.index] += 1
+        self.roster.leveled_up[self.index] = True
+
+    def set_level(self, new_level):
+        self.roster.level[self.index] = new_level
+
+    def get_attack(self):
+        return self._stats().get_attack(self.get_level())
+
+    def get_defense(self):
+        return self._stats().get_defense(self.get_level())
+
+    def get_speed(self):
+        return self._stats().get_speed(self.get_level())
+
+    def get_max_hp(self):
+        return self._stats().get_max_hp(self.get_level())
+
+    # These only use the methods and the hp/leveled_up attributes above,
+    # so they behave exactly as for MonsterBase instances.
+    get_hp = MonsterBase.get_hp
+    set_hp = MonsterBase.set_hp
+    alive = MonsterBase.alive
+    attack = MonsterBase.attack
+    remove_health = MonsterBase.remove_health
+    ready_to_evolve = MonsterBase.ready_to_evolve
+    __str__ = MonsterBase.__str__
+
+    def evolve(self) -> MonsterView:
+        """
+        Turns this monster into its evolution, keeping its level and missing hp.
+        :returns: this view, which now shows the evolved monster
+        """
+        hp_diff = self.get_max_hp() - self.get_hp()
+        self.roster.class_id[self.index] = self.roster.class_id_of(self.get_evolution())
+        self.leveled_up = False
+        self.hp = self.get_max_hp() - hp_diff
+        return self
+
+    def get_name(self) -> str:
+        return self.monster_class().get_name()
+
+    def get_description(self) -> str:
+        return self.monster_class().get_description()
+
+    def get_evolution(self) -> type[MonsterBase]:
+        return self.monster_class().get_evolution()
+
+    def get_element(self) -> str:
+        return self.monster_class().get_element()
+
+    def get_element_type(self) -> Element:
+        return self.monster_class().get_element_type()
+
+    def can_be_spawned(self) -> bool:
+        return self.monster_class().can_be_spawned()
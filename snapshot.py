@@ -0,0 +1,68 @@
+"""
+Snapshots of parsed data files, so later runs can skip parsing them.
+
+A snapshot is a marshal file holding the parsed data, keyed by the source file's
+modification time, size and SHA-256 hash. It is used when the modification time and
+size match (as for .pyc files), or failing that when the hash does; otherwise the
+source is parsed again and the snapshot rewritten. Snapshots that can't be read or
+written are ignored, so a read-only directory just means parsing every time.
+
+Usage:
+```
+data = load_with_snapshot("monsters.yaml", "monsters.yaml.snapshot", yaml.safe_load)
+```
+"""
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+from typing import Callable, Optional
+
+# Bump when the snapshot layout changes, so old snapshots are ignored.
+SNAPSHOT_VERSION = 1
+
+
+def load_with_snapshot(path: str, snapshot_path: Optional[str], parse: Callable[[bytes], object]):
+    """
+    Returns parse(contents of path), from the snapshot at snapshot_path when it is up to date.
+    parse must return data marshal can store (built-in types only).
+    If snapshot_path is None, the file is always parsed.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+        stat = os.fstat(f.fileno())
+    if snapshot_path is None:
+        return parse(raw)
+    key = (stat.st_mtime_ns, stat.st_size)
+    digest = None
+    try:
+        with open(snapshot_path, "rb") as f:
+            version, snapshot_key, snapshot_digest, data = marshal.load(f)
+        if version == SNAPSHOT_VERSION:
+            if snapshot_key == key:
+                return data
+            digest = hashlib.sha256(raw).hexdigest()
+            if snapshot_digest == digest:
+                _write_snapshot(snapshot_path, key, digest, data)
+                return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    data = parse(raw)
+    _write_snapshot(snapshot_path, key, digest or hashlib.sha256(raw).hexdigest(), data)
+    return data
+
+
+def _write_snapshot(snapshot_path: str, key: tuple[int, int], digest: str, data) -> None:
+    # Written to a temporary file first so concurrent readers never see half a snapshot.
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            marshal.dump((SNAPSHOT_VERSION, key, digest, data), f)
+        os.replace(tmp_path, snapshot_path)
+    except (OSError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -1,27 +1,31 @@
 import abc
 import math
+from collections import OrderedDict
 
 from data_structures.referential_array import ArrayR
-from data_structures.abstract_list import MonsterList
 from data_structures.stack_adt import ArrayStack
 
 
 class Stats(abc.ABC):
+    """
+    Stats of a monster type. Getters take the monster's level;
+    stats that don't scale with level ignore it.
+    """
 
     @abc.abstractmethod
-    def get_attack(self):
+    def get_attack(self, level: int = 1):
         pass
 
     @abc.abstractmethod
-    def get_defense(self):
+    def get_defense(self, level: int = 1):
         pass
 
     @abc.abstractmethod
-    def get_speed(self):
+    def get_speed(self, level: int = 1):
         pass
 
     @abc.abstractmethod
-    def get_max_hp(self):
+    def get_max_hp(self, level: int = 1):
         pass
 
 
@@ -42,25 +46,176 @@ class SimpleStats(Stats):
         self._speed = speed
         self._max_hp = max_hp
 
-    def get_attack(self):
-        """Returns the attack stat.
+    def get_attack(self, level: int = 1):
+        """Returns the attack stat. Simple stats do not depend on level.
 
         :returns: The attack stat.
         :complexity: O(1)
         """
         return self._attack
 
-    def get_defense(self):
+    def get_defense(self, level: int = 1):
         return self._defense
 
-    def get_speed(self):
+    def get_speed(self, level: int = 1):
         return self._speed
 
-    def get_max_hp(self):
+    def get_max_hp(self, level: int = 1):
         return self._max_hp
 
+
+_BINARY_OPERATORS = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": lambda a, b: a / b,
+    "power": lambda a, b: a ** b,
+}
+
+
+def _middle(a, b, c):
+    """Median of three values."""
+    return max(min(a, b), min(max(a, b), c))
+
+
+def _as_function(node):
+    """Turns a compiled node, (True, constant, 0) or (False, function of level, ops), into a function of level."""
+    is_constant, value, _ = node
+    if is_constant:
+        return lambda level: value
+    return value
+
+
+def compile_formula(formula: ArrayR[str]):
+    """Compiles a postfix stat formula into a function of level.
+
+    Tokens are numbers, `level`, the binary operators `+ - * / power`, `sqrt`
+    (one operand) and `middle` (median of three operands). Sub-formulas that
+    don't involve `level` are evaluated here, once, so the returned function
+    only does the level-dependent work.
+
+    Example: ["level", "3", "power", "1", "2", "3", "middle", "*"] compiles to level**3 * 2
+
+    :raises ValueError: if a token is unknown or operands don't match operators.
+    :complexity: O(n) where n is the length of the formula. The returned function is O(n) per call.
+    """
+    return _compile(formula)[0]
+
+
+def _compile(formula: ArrayR[str]):
+    """
+    compile_formula, also returning the number of operations the function does per call:
+    0 for a constant or `level` itself.
+    """
+    stack = ArrayStack(len(formula))
+
+    def pop():
+        if stack.is_empty():
+            raise ValueError(f"Formula {formula} is missing an operand")
+        return stack.pop()
+
+    # Closures bind their operands as default arguments, since the loop reassigns fa/fb/fc.
+    for i in range(len(formula)):
+        token = formula[i]
+        if token == "level":
+            stack.push((False, lambda level: level, 0))
+        elif token in _BINARY_OPERATORS:
+            op = _BINARY_OPERATORS[token]
+            b = pop()
+            a = pop()
+            if a[0] and b[0]:
+                stack.push((True, op(a[1], b[1]), 0))
+            else:
+                fa, fb = _as_function(a), _as_function(b)
+                stack.push((False, lambda level, op=op, fa=fa, fb=fb: op(fa(level), fb(level)), a[2] + b[2] + 1))
+        elif token == "sqrt":
+            a = pop()
+            if a[0]:
+                stack.push((True, math.sqrt(a[1]), 0))
+            else:
+                fa = a[1]
+                stack.push((False, lambda level, fa=fa: math.sqrt(fa(level)), a[2] + 1))
+        elif token == "middle":
+            c = pop()
+            b = pop()
+            a = pop()
+            if a[0] and b[0] and c[0]:
+                stack.push((True, _middle(a[1], b[1], c[1]), 0))
+            else:
+                fa, fb, fc = _as_function(a), _as_function(b), _as_function(c)
+                stack.push((False, lambda level, fa=fa, fb=fb, fc=fc: _middle(fa(level), fb(level), fc(level)), a[2] + b[2] + c[2] + 1))
+        else:
+            try:
+                number = int(token)
+            except ValueError:
+                try:
+                    number = float(token)
+                except ValueError:
+                    raise ValueError(f"Unknown token {token!r} in formula {formula}") from None
+            stack.push((True, number, 0))
+
+    result = pop()
+    if not stack.is_empty():
+        raise ValueError(f"Formula {formula} has operands left over")
+    return _as_function(result), result[2]
+
+
+class LevelCache:
+    """
+    Bounded least-recently-used cache of values keyed by level.
+
+    Attributes:
+        max_size (int): number of levels kept before the least recently used is evicted
+        hits (int): lookups answered from the cache
+        misses (int): lookups that had to compute the value
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        :raises ValueError: if max_size is not positive.
+        :complexity: O(1)
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+
+    def get(self, level: int, compute):
+        """Returns the cached value for level, calling compute(level) and caching it on a miss.
+        :complexity: O(1) plus the cost of compute on a miss
+        """
+        values = self._values
+        if level in values:
+            self.hits += 1
+            values.move_to_end(level)
+            return values[level]
+        self.misses += 1
+        value = compute(level)
+        values[level] = value
+        if len(values) > self.max_size:
+            values.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters."""
+        self._values.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
 class ComplexStats(Stats):
 
+    # Levels whose stats are kept per monster type.
+    CACHE_SIZE = 64
+    # Formulas doing fewer level-dependent operations than this are quicker to evaluate
+    # than to look up, so they get no cache (see benchmarks/bench_level_cache.py).
+    CACHE_MIN_OPS = 2
+
     def __init__(
 
         self,
@@ -72,119 +227,60 @@ class ComplexStats(Stats):
 
         """Initializes an instance of the ComplexStats class with given formulas for each stat.
 
+        Each formula is compiled once here (see compile_formula), which happens when
+        helpers builds the monster classes.
+
         :param attack_formula: Formula for calculating attack stat.
         :param defense_formula: Formula for calculating defense stat.
         :param speed_formula: Formula for calculating speed stat.
         :param max_hp_formula: Formula for calculating max_hp stat.
-        :complexity: O(1)
+        :raises ValueError: if a formula is malformed.
+        :complexity: O(n) where n is the total length of the formulas
 
-        all get methods run in O(n)
+        all get methods run in O(1) for cached levels, else O(n) for the level-dependent part of the formula
         """
         self.attack_formula = attack_formula
         self.defense_formula = defense_formula
         self.speed_formula = speed_formula
         self.max_hp_formula = max_hp_formula
-
-           
-    def get_attack(self, level: int):
+        # One ComplexStats is shared by every monster of a type, so the caches are per type.
+        # Stats depend only on level, so a monster levelling up simply looks up a new key.
+        # A stat's cache is None if its formula is too cheap to be worth caching.
+        self._attack, self.attack_cache = self._compile_stat(attack_formula)
+        self._defense, self.defense_cache = self._compile_stat(defense_formula)
+        self._speed, self.speed_cache = self._compile_stat(speed_formula)
+        self._max_hp, self.max_hp_cache = self._compile_stat(max_hp_formula)
+
+    def _compile_stat(self, formula: ArrayR[str]):
+        """Returns the compiled formula and a LevelCache for it, or None if it is cheaper than CACHE_MIN_OPS."""
+        function, ops = _compile(formula)
+        if ops < self.CACHE_MIN_OPS:
+            return function, None
+        return function, LevelCache(self.CACHE_SIZE)
+
+    def get_attack(self, level: int = 1):
         """Calculates and returns the attack stat.
 
         :param level: The level for which the attack stat is calculated.
         :returns: The calculated attack stat.
-        :complexity: O(n), where n is the length of the attack formula array.
+        :complexity: O(1) if the level is cached or the formula is too cheap to cache,
+            otherwise O(n) where n is the length of the level-dependent part of the attack formula.
         """
-        formula = self.attack_formula
-        stack = ArrayStack(len(formula))
-        for i in range(len(formula)-1,-1,-1):
-            stack.push(formula[i])
-        a = stack.pop()
-        if stack.is_empty():
-            return level
-        b = stack.pop()
-        value = self.calculator(stack, level, a, b)
-        return value
-
-    def get_defense(self, level: int):
-        formula = self.defense_formula
-        stack = ArrayStack(len(formula))
-        for i in range(len(formula)-1,-1,-1):
-            stack.push(formula[i])
-        a = stack.pop()
-        if stack.is_empty():
-            return level
-        b = stack.pop()
-        value = self.calculator(stack, level, a, b)
-        return value
-
-    def get_speed(self, level: int):
-        formula = self.speed_formula
-        stack = ArrayStack(len(formula))
-        for i in range(len(formula)-1,-1,-1):
-            stack.push(formula[i])
-        a = stack.pop()
-        if stack.is_empty():
-            return level
-        b = stack.pop()
-        value = self.calculator(stack, level, a, b)
-        return value
-
-    def get_max_hp(self, level: int):
-        formula = self.max_hp_formula
-        stack = ArrayStack(len(formula))
-        for i in range(len(formula)-1,-1,-1):
-            stack.push(formula[i])
-        a = stack.pop()
-        if stack.is_empty():
-            return level
-        b = stack.pop()
-        value = self.calculator(stack, level, a, b)
-        return value
-
-    def calculator(self, stack:ArrayStack, level:int, a, b):
-        """Helper method to calculate stat value using given formula.
-
-        :param stack: Stack containing the elements of the formula.
-        :param level: The level for which the stat is calculated.
-        :param a, b: Intermediate variables for calculation.
-        :returns: The calculated stat value.
-        :complexity: O(n), where n is the length of the formula array.
-        """
-        if type(a) == str:
-            # a will never be the terminating element in the formula as level represents a number, not an operation
-            a = level
-            value = self.calculator(stack, level, a, b)
-            return value
-        if type(b) == str:
-            a = math.sqrt(a)
-            if stack.is_empty(): a
-            value = self.calculator(stack, level, a, stack.pop())
-            return value
-        c = stack.pop()
-        if type(c) != str:
-            #if c is not a string, then it is a number and must be followed by an operator so the stack must not be empty
-            a = (a+b+c)/3
-            value = self.calculator(stack, level, a, stack.pop())
-            return value
-        a = self.operations(c,a,b)
-        if stack.is_empty(): a
-        value = self.calculator(stack, level, stack.pop)
-        return value
-
-    def operations(self, opr:str, a, b):
-        """Applies the operation to the operands.
-
-        :param opr: The operation to be applied.
-        :param a, b: Operands for the operation.
-        :returns: The result of the operation.
-        :complexity: O(1)
-    """
-        if opr == "+":
-            return a+b
-        if opr == "/":
-            return a/b
-        if opr == "-":
-            return a-b
-        if opr == "*":
-            return a*b
-        if opr == "power":
-            return a**b
\ No newline at end of file
+        if self.attack_cache is None:
+            return self._attack(level)
+        return self.attack_cache.get(level, self._attack)
+
+    def get_defense(self, level: int = 1):
+        if self.defense_cache is None:
+            return self._defense(level)
+        return self.defense_cache.get(level, self._defense)
+
+    def get_speed(self, level: int = 1):
+        if self.speed_cache is None:
+            return self._speed(level)
+        return self.speed_cache.get(level, self._speed)
+
+    def get_max_hp(self, level: int = 1):
+        if self.max_hp_cache is None:
+            return self._max_hp(level)
+        return self.max_hp_cache.get(level, self._max_hp)
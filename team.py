@@ -5,11 +5,11 @@ from typing import Optional, TYPE_CHECKING
 from base_enum import BaseEnum
 from monster_base import MonsterBase
 from random_gen import RandomGen
-from helpers import get_all_monsters
+from helpers import get_all_monsters, get_spawnable_monsters
 
 from data_structures.referential_array import ArrayR
-from data_structures.queue_adt import CircularMonsterQueue
-from data_structures.abstract_list import MonsterList
+from data_structures.queue_adt import CircularMonsterDeque
+from data_structures.heap import ArrayHeap
 
 if TYPE_CHECKING:
     from battle import Battle
@@ -40,17 +40,10 @@ class MonsterTeam:
 
 
     def __init__(self, team_mode: TeamMode, selection_mode, **kwargs) -> None:
-        #initialize team
-        self.team = MonsterList()
-        self.descending = True
-
-        self.name = kwargs.get('team_name', None)
-        #value to sort by if optimize is being used
-        self.sort_key = kwargs.get('sort_key', None)
+        self._make_empty(team_mode, **kwargs)
         #loads team with monsters
-        self.team_mode = team_mode
         if selection_mode == self.SelectionMode.RANDOM:
-            self.select_randomly()
+            self.select_randomly(kwargs.get('rng', RandomGen))
         elif selection_mode == self.SelectionMode.MANUAL:
             self.select_manually()
         elif selection_mode == self.SelectionMode.PROVIDED:
@@ -59,6 +52,38 @@ class MonsterTeam:
         else:
             raise ValueError(f"selection_mode {selection_mode} not supported.")
 
+    @classmethod
+    def from_monsters(cls, team_mode: TeamMode, monsters, **kwargs) -> MonsterTeam:
+        """
+        Makes a team of already created monster instances, added in order with add_to_team.
+        Skips the selection step of the constructor, for generating many teams at once.
+
+        Complexity: O(n) for FRONT/BACK teams, O(n log n) for OPTIMISE, where n is len(monsters)
+        """
+        team = cls.__new__(cls)
+        team._make_empty(team_mode, **kwargs)
+        if team_mode == cls.TeamMode.BACK:
+            append = team.team.append
+            for monster in monsters:
+                append(monster)
+        else:
+            for monster in monsters:
+                team.add_to_team(monster)
+        return team
+
+    def _make_empty(self, team_mode: TeamMode, **kwargs) -> None:
+        self.descending = True
+        self.name = kwargs.get('team_name', None)
+        #value to sort by if optimize is being used
+        self.sort_key = kwargs.get('sort_key', None)
+        #initialize team, FRONT and BACK only ever add/remove at the ends so use a deque,
+        #OPTIMISE keeps the team in sort_key order with a heap
+        self.team_mode = team_mode
+        if team_mode == self.TeamMode.OPTIMISE:
+            self.team = ArrayHeap(self.sort_key, self.descending, self.TEAM_LIMIT)
+        else:
+            self.team = CircularMonsterDeque(self.TEAM_LIMIT)
+
     def add_to_team(self, monster: MonsterBase):
         """
         Adds a monster to the team based on the team_mode.
@@ -71,25 +96,27 @@ class MonsterTeam:
         - BACK: Adds the monster to the end of the team list.
         - OPTIMISE: Adds the monster to the team and sorts the team based on some criteria.
         
-        Front complexity: O(n)
-        Back complexity: O(n)
-        OPTIMIZE complexity: O(n^2)
+        Front complexity: O(1) amortized
+        Back complexity: O(1) amortized
+        OPTIMIZE complexity: O(log n)
         """
         if self.team_mode == self.TeamMode.FRONT:
-            self.team.insert(0, monster)
+            self.team.prepend(monster)
         elif self.team_mode == self.TeamMode.BACK:
             self.team.append(monster)
         elif self.team_mode == self.TeamMode.OPTIMISE:
-            self.team.insert(0,monster)
-            self.team.sort(self.descending, self.sort_key) 
+            self.team.add(monster)
 
     def retrieve_from_team(self) -> MonsterBase:
         """
         retrieves the first living monster on team and returns it. If no monster living, Returns None.
 
-        complexity: O(n)
+        complexity: O(n), O(1) for FRONT/BACK teams when the front monster is alive,
+        O((d+1) log n) for OPTIMISE teams where d is the number of fainted monsters ahead of it
         
         """
+        if self.team_mode == self.TeamMode.OPTIMISE:
+            return self.team.pop_where(lambda monster: monster.alive())
         for i in range(len(self.team)):
             monster = self.team[i]
             if monster.alive():
@@ -104,7 +131,7 @@ class MonsterTeam:
 
         Front complexity: O(1)
         Back complexity: O(n)
-        Optimize complexity: O(n^2)
+        Optimize complexity: O(n)
         
         """
         if self.team_mode == self.TeamMode.FRONT:
@@ -118,7 +145,7 @@ class MonsterTeam:
             if type(self.sort_key) != self.SortMode:
                 raise TypeError("sort key must be of type SortMode")
             self.descending = not self.descending
-            self.team.sort(self.descending, self.sort_key)
+            self.team.flip()
 
     def regenerate_team(self) -> None:
         """
@@ -127,34 +154,50 @@ class MonsterTeam:
         Complexity: O(n)
         
         """
-        for i in range(len(self.team)):
-            self.team[i].set_hp(self.team[i].get_max_hp())
+        roster = self._shared_roster()
+        if roster is not None:
+            # One array fill instead of a set_hp call per monster.
+            indices = [self.team[i].index for i in range(len(self.team))]
+            roster.regenerate(indices)
+        else:
+            for i in range(len(self.team)):
+                self.team[i].set_hp(self.team[i].get_max_hp())
+        if self.team_mode == self.TeamMode.OPTIMISE:
+            # HP keys have changed.
+            self.team.rekey()
         
-    def select_randomly(self):
+    def _shared_roster(self):
         """
-        sets team with a random number and type of monsters
+        The MonsterRoster holding every monster of the team, if they are all views of the same one.
+        Every monster has a roster attribute (see MonsterBase.roster), which is None unless it is a view.
 
         Complexity: O(n)
+        """
+        if len(self.team) == 0:
+            return None
+        roster = self.team[0].roster
+        if roster is None:
+            return None
+        for i in range(1, len(self.team)):
+            if self.team[i].roster is not roster:
+                return None
+        return roster
+
+    def select_randomly(self, rng=RandomGen):
+        """
+        sets team with a random number and type of monsters,
+        drawn from rng (the shared RandomGen by default, or a RandomGen instance)
+
+        Complexity: O(n) where n is the team size, plus the cost of add_to_team
         
         """
-        team_size = RandomGen.randint(1, self.TEAM_LIMIT)
-        monsters = get_all_monsters()
-        n_spawnable = 0
-        for x in range(len(monsters)):
-            if monsters[x].can_be_spawned():
-                n_spawnable += 1
+        team_size = rng.randint(1, self.TEAM_LIMIT)
+        # Same RandomGen calls as scanning the catalog for the chosen spawnable monster.
+        spawnable = get_spawnable_monsters()
+        if len(spawnable) == 0:
+            raise ValueError("Spawning logic failed.")
         for _ in range(team_size):
-            spawner_index = RandomGen.randint(0, n_spawnable-1)
-            cur_index = -1
-            for x in range(len(monsters)):
-                if monsters[x].can_be_spawned():
-                    cur_index += 1
-                    if cur_index == spawner_index:
-                        # Spawn this monster
-                        self.add_to_team(monsters[x]())
-                        break
-            else:
-                raise ValueError("Spawning logic failed.")
+            self.add_to_team(spawnable[rng.randint(0, len(spawnable)-1)]())
 
     def select_manually(self):
         """
@@ -312,13 +355,15 @@ class MonsterTeam:
 
         Example team if in TeamMode.FRONT:
         [Gustwing Instance, Aquariuma Instance, Flamikin Instance]
+
+        :raises ValueError: if more than TEAM_LIMIT monsters would be added.
         """
         if provided_monsters == None:
             raise ValueError("You need to pass an array of type MonsterBase")
         for monster in provided_monsters:
-            if self.team.is_full():
-                print("The list you provided had more monsters than the allowed total, not all monsters were added to your team")
-                break
+            # The team containers grow as needed, so the limit is checked here.
+            if len(self.team) >= self.TEAM_LIMIT:
+                raise ValueError(f"A team can have at most {self.TEAM_LIMIT} monsters")
             if monster.can_be_spawned():
                 self.add_to_team(monster)
 
@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+from random_gen import RandomGen
+
+from battle import Battle
+from batch_battle import BatchBattle
+from team import MonsterTeam
+
+MODES = [
+    (MonsterTeam.TeamMode.FRONT, None),
+    (MonsterTeam.TeamMode.BACK, None),
+    (MonsterTeam.TeamMode.OPTIMISE, MonsterTeam.SortMode.HP),
+    (MonsterTeam.TeamMode.OPTIMISE, MonsterTeam.SortMode.ATTACK),
+    (MonsterTeam.TeamMode.OPTIMISE, MonsterTeam.SortMode.SPEED),
+]
+
+def random_team():
+    team_mode, sort_key = MODES[RandomGen.randint(0, len(MODES)-1)]
+    return MonsterTeam(team_mode, MonsterTeam.SelectionMode.RANDOM, sort_key=sort_key)
+
+class TestBatchBattle(TestCase):
+
+    def assertMatchesBattle(self, pairs):
+        results = BatchBattle().battle(pairs)
+        # Batch battles leave the teams alone, so the same teams can be battled normally afterwards.
+        expected = [Battle(verbosity=0).battle(team1, team2) for team1, team2 in pairs]
+        self.assertListEqual(list(results), expected)
+
+    @number("4.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout(30)
+    def test_seeded_random_teams(self):
+        for seed in (1, 123456789, 2023):
+            RandomGen.set_seed(seed)
+            pairs = [(random_team(), random_team()) for _ in range(150)]
+            self.assertMatchesBattle(pairs)
+
+    @number("4.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_teams_not_modified(self):
+        RandomGen.set_seed(42)
+        team1, team2 = random_team(), random_team()
+        before = (str(team1), str(team2))
+        BatchBattle().battle([(team1, team2)])
+        self.assertEqual((str(team1), str(team2)), before)
+
+    @number("4.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_dead_team(self):
+        team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
+        dead = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
+        for i in range(len(dead)):
+            dead.team[i].set_hp(0)
+        self.assertRaises(ValueError, lambda: BatchBattle().battle([(team, dead)]))
@@ -1,3 +1,4 @@
+import json
 from unittest import TestCase
 
 from ed_utils.decorators import number, visibility
@@ -133,3 +134,34 @@ class TestBattle(TestCase):
         ]
         res = b.battle(team1, team2)
         self.assertEqual(res, Battle.Result.DRAW)
+
+    @number("4.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_profiling(self):
+        def make_teams():
+            team1 = MonsterTeam.from_monsters(MonsterTeam.TeamMode.BACK, [Aquariuma(), Aquariuma()])
+            team2 = MonsterTeam.from_monsters(MonsterTeam.TeamMode.FRONT, [Aquariuma(), Aquariuma()])
+            team1.choose_action = lambda out, team: Battle.Action.ATTACK
+            team2.choose_action = lambda out, team: Battle.Action.ATTACK
+            return team1, team2
+
+        plain = Battle(verbosity=0)
+        self.assertIsNone(plain.stats)
+        expected = plain.battle(*make_teams())
+        b = Battle(verbosity=0, profile=True)
+        self.assertEqual(b.battle(*make_teams()), expected)
+        stats = b.stats
+        turns = plain.turn_number
+        self.assertEqual((stats.battles, stats.turns, stats.max_turns), (1, turns, turns))
+        self.assertEqual(stats.actions, {"ATTACK": 2*turns, "SWAP": 0, "SPECIAL": 0})
+        # Equal speeds, so both monsters attack twice every turn.
+        self.assertEqual(stats.attack_calls, 4*turns)
+        self.assertEqual(set(stats.phase_seconds), set(stats.PHASES))
+        self.assertTrue(all(t >= 0 for t in stats.phase_seconds.values()))
+
+        data = json.loads(stats.to_json())
+        self.assertEqual(data["mean_turns"], turns)
+        self.assertEqual(data["actions"]["ATTACK"], 2*turns)
+        stats.reset()
+        self.assertEqual((stats.battles, stats.turns, stats.attack_calls), (0, 0, 0))
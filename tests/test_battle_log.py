@@ -0,0 +1,215 @@
+import mmap
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from battle import Battle
+from battle_log import BattleLogReader, BattleLogWriter
+from helpers import Aquariuma, Flamikin
+from monster_base import MonsterBase
+from stats import SimpleStats
+from random_gen import RandomGen
+from team import MonsterTeam
+
+
+class StrongFlamikin(Flamikin):
+
+    def get_attack(self):
+        return 10000000
+
+    def get_max_hp(self):
+        return 10000000
+
+
+class Unlisted(MonsterBase):
+    """A monster class that is not in the catalog, with a fractional max hp."""
+
+    @classmethod
+    def get_name(cls):
+        return "Unlisted"
+
+    @classmethod
+    def get_description(cls):
+        return ""
+
+    @classmethod
+    def get_evolution(cls):
+        return None
+
+    @classmethod
+    def get_element(cls):
+        return Flamikin.get_element()
+
+    @classmethod
+    def can_be_spawned(cls):
+        return False
+
+    @classmethod
+    def get_simple_stats(cls):
+        return SimpleStats(2, 1, 1, 2.5)
+
+    @classmethod
+    def get_complex_stats(cls):
+        return cls.get_simple_stats()
+
+
+def random_pairs(n):
+    return [
+        (
+            MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM),
+            MonsterTeam(MonsterTeam.TeamMode.FRONT, MonsterTeam.SelectionMode.RANDOM),
+        )
+        for _ in range(n)
+    ]
+
+
+class TestBattleLog(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "battles.blog")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    @number("4.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_round_trip(self):
+        RandomGen.set_seed(2023)
+        results, turns = [], []
+        with BattleLogWriter(self.path) as log:
+            b = Battle(verbosity=0, log=log)
+            for team1, team2 in random_pairs(50):
+                results.append(b.battle(team1, team2))
+                turns.append(b.turn_number)
+
+        # Appending to an existing log keeps what is there.
+        team1 = MonsterTeam.from_monsters(MonsterTeam.TeamMode.BACK, [Aquariuma(), Aquariuma()])
+        team2 = MonsterTeam.from_monsters(MonsterTeam.TeamMode.FRONT, [Aquariuma(), Aquariuma()])
+        team1.choose_action = lambda out, team: Battle.Action.ATTACK
+        team2.choose_action = lambda out, team: Battle.Action.ATTACK
+        with BattleLogWriter(self.path) as log:
+            b = Battle(verbosity=0, log=log)
+            results.append(b.battle(team1, team2))
+            turns.append(b.turn_number)
+
+        with BattleLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 51)
+            self.assertListEqual(reader.results(), results)
+            self.assertListEqual([reader.turn_count(i) for i in range(len(reader))], turns)
+
+            mirror = reader[50]
+            self.assertEqual(mirror.result, results[-1])
+            self.assertEqual(len(mirror.turns), turns[-1])
+            full_hp = Aquariuma().get_max_hp()
+            hp1 = hp2 = full_hp
+            slot1 = slot2 = 0
+            for turn in mirror.turns:
+                self.assertEqual((turn.action1, turn.action2), (Battle.Action.ATTACK, Battle.Action.ATTACK))
+                self.assertEqual((turn.monster1, turn.monster2), (Aquariuma, Aquariuma))
+                self.assertEqual((turn.slot1, turn.slot2), (slot1, slot2))
+                # Both lose 1 more HP if both survive the attacks.
+                tick = 1 if hp1 - turn.damage2 > 0 and hp2 - turn.damage1 > 0 else 0
+                self.assertEqual((turn.hp1, turn.hp2), (hp1 - turn.damage2 - tick, hp2 - turn.damage1 - tick))
+                # Fainted monsters are replaced by a fresh Aquariuma.
+                hp1 = turn.hp1 if turn.hp1 > 0 else full_hp
+                hp2 = turn.hp2 if turn.hp2 > 0 else full_hp
+                slot1 += turn.hp1 <= 0
+                slot2 += turn.hp2 <= 0
+
+            lines = list(reader.replay(50))
+            self.assertEqual(len(lines), turns[-1] + 1)
+            self.assertTrue(lines[0].startswith("Turn 1: #0 Aquariuma ATTACK"))
+            self.assertEqual(lines[-1], f"Result: {results[-1].name}")
+
+    @number("4.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_bad_files(self):
+        RandomGen.set_seed(7)
+        with BattleLogWriter(self.path) as log:
+            b = Battle(verbosity=0, log=log)
+            for team1, team2 in random_pairs(3):
+                b.battle(team1, team2)
+
+        # A battle cut off part way through is left out.
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data[:-1])
+        with BattleLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 2)
+            self.assertRaises(IndexError, lambda: reader[2])
+
+        with open(self.path, "wb") as f:
+            f.write(b"not a battle log")
+        self.assertRaises(ValueError, lambda: BattleLogReader(self.path))
+        # The rejected file is not left mapped, so it can be replaced straight away.
+        maps = []
+        real_mmap = mmap.mmap
+
+        def recording_mmap(*args, **kwargs):
+            maps.append(real_mmap(*args, **kwargs))
+            return maps[-1]
+
+        with mock.patch("mmap.mmap", recording_mmap):
+            self.assertRaises(ValueError, lambda: BattleLogReader(self.path))
+        self.assertTrue(maps[0].closed)
+        self.assertRaises(ValueError, lambda: BattleLogWriter(self.path))
+        with open(self.path, "wb") as f:
+            f.write(b"BT")
+        self.assertRaises(ValueError, lambda: BattleLogReader(self.path))
+        self.assertRaises(ValueError, lambda: BattleLogWriter(self.path))
+
+    @number("4.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_large_and_unlisted_monsters(self):
+        strong = StrongFlamikin()
+        unlisted = Unlisted()
+        # Hand-written monsters get get_element_type from MonsterBase.
+        self.assertEqual(Unlisted.get_element_type(), Flamikin.get_element_type())
+        team1 = MonsterTeam.from_monsters(MonsterTeam.TeamMode.BACK, [strong])
+        team2 = MonsterTeam.from_monsters(MonsterTeam.TeamMode.BACK, [unlisted])
+        team1.choose_action = lambda out, team: Battle.Action.ATTACK
+        team2.choose_action = lambda out, team: Battle.Action.ATTACK
+        with BattleLogWriter(self.path) as log:
+            result = Battle(verbosity=0, log=log).battle(team1, team2)
+        with BattleLogReader(self.path) as reader:
+            battle = reader[0]
+            self.assertEqual(battle.result, result)
+            turn = battle.turns[0]
+            # Subclasses are logged as their catalog class, others as unknown.
+            self.assertEqual((turn.monster1, turn.monster2), (Flamikin, None))
+            self.assertEqual(turn.hp1, strong.get_hp())
+            self.assertEqual(turn.hp2, unlisted.get_hp())
+            self.assertEqual(turn.damage1, 2.5 - unlisted.get_hp())
+            self.assertGreater(turn.damage1, 32767)
+            self.assertTrue(list(reader.replay(0))[0].startswith("Turn 1: #0 Flamikin ATTACK"))
+
+    @number("4.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_slots(self):
+        team1 = MonsterTeam.from_monsters(MonsterTeam.TeamMode.BACK, [Aquariuma(), Aquariuma(), Flamikin()])
+        team2 = MonsterTeam.from_monsters(MonsterTeam.TeamMode.BACK, [Aquariuma(), Aquariuma()])
+        team1.choose_action = lambda out, team: Battle.Action.SWAP
+        team2.choose_action = lambda out, team: Battle.Action.ATTACK
+        with BattleLogWriter(self.path) as log:
+            Battle(verbosity=0, log=log).battle(team1, team2)
+        with BattleLogReader(self.path) as reader:
+            turns = reader[0].turns
+        # Each of team 1's monsters keeps its slot as it is swapped in and out,
+        # so its hp can be followed even with two of the same class.
+        self.assertEqual({turn.slot1 for turn in turns}, {0, 1, 2})
+        classes, hp = {}, {}
+        for turn in turns:
+            self.assertEqual(classes.setdefault(turn.slot1, turn.monster1), turn.monster1)
+            self.assertLessEqual(turn.hp1, hp.get(turn.slot1, turn.monster1().get_max_hp()))
+            hp[turn.slot1] = turn.hp1
+        self.assertEqual(sorted(classes.values(), key=lambda m: m.get_name()), [Aquariuma, Aquariuma, Flamikin])
@@ -1,9 +1,16 @@
+import os
+import subprocess
+import sys
+import tempfile
 from unittest import TestCase
 
 from ed_utils.decorators import number, visibility
 from ed_utils.timeout import timeout
 
 from elements import EffectivenessCalculator, Element
+from helpers import Infernox, Metalhorn
+
+from data_structures.referential_array import ArrayR
 
 class TestElementEffectiveness(TestCase):
 
@@ -16,3 +23,85 @@ class TestElementEffectiveness(TestCase):
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.NORMAL, Element.GHOST), 0)
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.DRAGON, Element.DRAGON), 2)
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.WATER, Element.GRASS), 0.5)
+
+    @number("2.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_custom_table(self):
+        try:
+            EffectivenessCalculator(
+                ArrayR.from_list(["Fire", "Water", "Grass"]),
+                ArrayR.from_list([0.5, 0.5, 2, 2, 0.5, 0.5, 0.5, 2, 0.5]),
+            )
+            self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.GRASS), 2)
+            self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.WATER, Element.FIRE), 2)
+            self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.GRASS, Element.GRASS), 0.5)
+            n, positions, matrix = EffectivenessCalculator.get_table()
+            self.assertEqual(n, 3)
+            self.assertEqual(matrix[n*positions[Element.WATER.value] + positions[Element.FIRE.value]], 2)
+            self.assertEqual(positions[Element.ICE.value], -1)
+            # Elements missing from the table cannot be looked up.
+            self.assertRaises(ValueError, lambda: EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.ICE))
+            # The value array must be n*n long.
+            self.assertRaises(ValueError, lambda: EffectivenessCalculator(
+                ArrayR.from_list(["Fire", "Water"]),
+                ArrayR.from_list([1, 1, 1]),
+            ))
+        finally:
+            EffectivenessCalculator.make_singleton()
+
+    @number("2.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_from_string(self):
+        self.assertEqual(Element.from_string("Ice"), Element.ICE)
+        self.assertEqual(Element.from_string("fIRE"), Element.FIRE)
+        self.assertRaises(ValueError, lambda: Element.from_string("Plasma"))
+        # Monster classes resolve their element once when they are made.
+        self.assertEqual(Infernox.get_element_type(), Element.FIRE)
+        self.assertEqual(Metalhorn.get_element_type(), Element.STEEL)
+
+    @number("2.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_lazy_import(self):
+        # Importing battle code loads neither the effectiveness table nor the monster catalog.
+        subprocess.run([sys.executable, "-c", (
+            "import battle, elements, helpers\n"
+            "assert elements.EffectivenessCalculator.instance is None\n"
+            "assert helpers._monsters is None\n"
+            "from elements import EffectivenessCalculator, Element\n"
+            "assert EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.GRASS) == 2\n"
+        )], check=True)
+
+    @number("2.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_configure(self):
+        directory = tempfile.mkdtemp()
+        csv_file = os.path.join(directory, "table.csv")
+        cache_file = os.path.join(directory, "table.cache")
+        with open(csv_file, "w") as f:
+            f.write("Fire,Water\n1,0.5\n3,1\n")
+        previous = (EffectivenessCalculator.csv_file, EffectivenessCalculator.cache_file)
+        try:
+            EffectivenessCalculator.configure(csv_file=csv_file, cache_file=cache_file)
+            self.assertIsNone(EffectivenessCalculator.instance)
+            self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.WATER, Element.FIRE), 3)
+            self.assertTrue(os.path.exists(cache_file))
+            # Loaded again from the cache.
+            EffectivenessCalculator.configure(csv_file=csv_file, cache_file=cache_file)
+            self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.WATER), 0.5)
+            # Leaving cache_file out keeps it; None turns it off.
+            EffectivenessCalculator.configure(csv_file=csv_file)
+            self.assertEqual(EffectivenessCalculator.cache_file, cache_file)
+            EffectivenessCalculator.configure(cache_file=None)
+            self.assertIsNone(EffectivenessCalculator.cache_file)
+            self.assertEqual(EffectivenessCalculator.csv_file, csv_file)
+        finally:
+            EffectivenessCalculator.configure(csv_file=previous[0], cache_file=previous[1])
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+        self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.WATER), 0.5)
+        self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.NORMAL, Element.GHOST), 0)
@@ -0,0 +1,83 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+import helpers
+from elements import Element
+
+
+class TestHelpers(TestCase):
+
+    @number("1.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_snapshot(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "monsters.yaml")
+            snapshot = os.path.join(directory, "monsters.yaml.snapshot")
+            shutil.copy(helpers.MONSTERS_FILE, path)
+
+            parsed = helpers.load_monster_data(path, snapshot)
+            self.assertTrue(os.path.exists(snapshot))
+            self.assertEqual(helpers.load_monster_data(path, snapshot), parsed)
+            self.assertEqual(parsed[0]["name"], helpers.get_all_monsters()[0].get_name())
+
+            # Same contents with a new modification time: found by hash.
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(helpers.load_monster_data(path, snapshot), parsed)
+
+            # Changed contents: the snapshot is stale.
+            with open(path, "w") as f:
+                f.write("- name: Testmon\n")
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(helpers.load_monster_data(path, snapshot), [{"name": "Testmon"}])
+
+            # A corrupt snapshot is ignored and replaced.
+            with open(snapshot, "wb") as f:
+                f.write(b"not a snapshot")
+            self.assertEqual(helpers.load_monster_data(path, snapshot), [{"name": "Testmon"}])
+        finally:
+            shutil.rmtree(directory)
+
+    @number("1.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_spawn_indexes(self):
+        monsters = helpers.get_all_monsters()
+        spawnable = helpers.get_spawnable_monsters()
+        self.assertIsInstance(spawnable, tuple)
+        self.assertEqual(list(spawnable), [m for m in monsters if m.can_be_spawned()])
+
+        fire = helpers.get_spawnable_by_element(Element.FIRE)
+        self.assertEqual(list(fire), [m for m in spawnable if m.get_element_type() == Element.FIRE])
+        self.assertIn(helpers.Flamikin, fire)
+
+        fast = helpers.get_spawnable_by_stat("speed", 7, 9)
+        self.assertEqual(
+            sorted(fast, key=lambda m: m.get_name()),
+            sorted([m for m in spawnable if 7 <= m.get_simple_stats().get_speed() <= 9], key=lambda m: m.get_name()),
+        )
+        speeds = [m.get_simple_stats().get_speed() for m in fast]
+        self.assertEqual(speeds, sorted(speeds))
+        self.assertRaises(ValueError, lambda: helpers.get_spawnable_by_stat("luck", 0, 1))
+
+    @number("1.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_missing_attribute(self):
+        # In a fresh interpreter, so the catalog has not been made yet.
+        subprocess.run([sys.executable, "-c", (
+            "import helpers\n"
+            "assert not hasattr(helpers, 'NotAMonster')\n"
+            "assert helpers._monsters is None\n"
+            "assert helpers.Flamikin.get_name() == 'Flamikin'\n"
+            "assert helpers._monsters is not None\n"
+        )], check=True)
+        self.assertRaises(AttributeError, lambda: helpers.NotAMonster)
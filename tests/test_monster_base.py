@@ -72,3 +72,12 @@ class TestMonsters(TestCase):
         self.assertEqual(t.get_max_hp(), 14)
         self.assertEqual(t.get_hp(), 12)
 
+
+    @number("1.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_fixed_layout(self):
+        monster = Infernox()
+        # Monsters use __slots__, so there is no per-instance dict.
+        self.assertFalse(hasattr(monster, "__dict__"))
+        self.assertRaises(AttributeError, lambda: setattr(monster, "nickname", "Blaze"))
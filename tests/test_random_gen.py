@@ -0,0 +1,116 @@
+import pickle
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from random_gen import RandomGen
+
+from data_structures.abstract_list import MonsterList
+from data_structures.referential_array import ArrayR
+
+
+class TestRandomGen(TestCase):
+
+    @number("6.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_instances(self):
+        RandomGen.set_seed(123)
+        expected = [RandomGen.random() for _ in range(20)]
+
+        gen = RandomGen(123)
+        other = RandomGen(999)
+        self.assertListEqual([gen.random() for _ in range(10)], expected[:10])
+        # Drawing from another generator or the class doesn't disturb gen.
+        other.random()
+        RandomGen.set_seed(5)
+        RandomGen.random()
+        self.assertListEqual([gen.random() for _ in range(10)], expected[10:])
+
+        # Methods are bound on lookup, so an instance holds only its state.
+        self.assertEqual(vars(gen), {"seed": gen.seed})
+        copy = pickle.loads(pickle.dumps(gen))
+        self.assertEqual(copy.randint(1, 100), gen.randint(1, 100))
+
+    @number("6.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_jump_and_spawn(self):
+        stepped = RandomGen(42)
+        for _ in range(1000):
+            stepped.random()
+        jumped = RandomGen(42)
+        jumped.jump(1000)
+        self.assertEqual(jumped.seed, stepped.seed)
+        # Jumping far ahead is cheap.
+        jumped.jump(10**15)
+        jumped.jump(0)
+        self.assertRaises(ValueError, lambda: jumped.jump(-1))
+
+        parent = RandomGen(7)
+        streams = parent.spawn(3, stride=50)
+        # Spawning is reproducible.
+        self.assertListEqual([s.seed for s in streams], [s.seed for s in RandomGen(7).spawn(3, stride=50)])
+        sequence = RandomGen(7)
+        for stream in streams:
+            start = RandomGen(sequence.seed)
+            self.assertEqual(stream.random(), start.random())
+            sequence.jump(50)
+        # The parent continues after the spawned blocks.
+        self.assertEqual(parent.seed, sequence.seed)
+        self.assertRaises(ValueError, lambda: RandomGen(1).spawn(2, stride=RandomGen.MOD))
+
+    @number("6.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_batches(self):
+        for n in (0, 1, 5, RandomGen.BATCH_CHUNK + 3):
+            RandomGen.set_seed(31)
+            expected = [RandomGen.random() for _ in range(n)]
+            after = RandomGen.random()
+            RandomGen.set_seed(31)
+            self.assertListEqual(RandomGen.random_batch(n).tolist(), expected)
+            self.assertEqual(RandomGen.random(), after)
+
+        gen = RandomGen(8)
+        expected = [gen.randint(2, 10) for _ in range(100)]
+        self.assertListEqual(RandomGen(8).randint_batch(2, 10, 100).tolist(), expected)
+
+    @number("6.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_shuffle_modes(self):
+        def original_shuffle(collection):
+            positions = [(RandomGen.random(), i) for i in range(len(collection))]
+            positions.sort()
+            tmp = [collection[p[1]] for p in positions]
+            for x in range(len(collection)):
+                collection[x] = tmp[x]
+
+        for seed in range(20):
+            RandomGen.set_seed(seed)
+            expected = list(range(30))
+            original_shuffle(expected)
+            RandomGen.set_seed(seed)
+            got = ArrayR.from_list(list(range(30)))
+            RandomGen.random_shuffle(got)
+            self.assertListEqual(got.to_list(), expected)
+
+        items = MonsterList()
+        for i in range(50):
+            items.append(i)
+        gen = RandomGen(4)
+        gen.random_shuffle(items, compatible=False)
+        shuffled = [items[i] for i in range(len(items))]
+        self.assertListEqual(sorted(shuffled), list(range(50)))
+        self.assertNotEqual(shuffled, list(range(50)))
+        # Reproducible for a seed, and uses n-1 numbers.
+        again = list(range(50))
+        other = RandomGen(4)
+        other.random_shuffle(again, compatible=False)
+        self.assertListEqual(again, shuffled)
+        self.assertEqual(other.seed, gen.seed)
+        check = RandomGen(4)
+        check.jump(49)
+        self.assertEqual(check.seed, gen.seed)
@@ -0,0 +1,90 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from battle import Battle
+from team import MonsterTeam
+from random_gen import RandomGen
+from roster import MonsterRoster
+from helpers import Flamikin, Infernoth, Infernox
+
+from data_structures.referential_array import ArrayR
+
+
+class TestRoster(TestCase):
+
+    @number("1.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_views(self):
+        roster = MonsterRoster(simple_mode=True)
+        view = roster.spawn(Flamikin)
+        real = Flamikin()
+        self.assertEqual(str(view), str(real))
+        self.assertEqual(view.get_attack(), real.get_attack())
+        self.assertEqual(view.get_element_type(), real.get_element_type())
+        self.assertEqual(view, roster[0])
+        self.assertIs(view.roster, roster)
+        self.assertIsNone(real.roster)
+
+        view.set_hp(3)
+        self.assertEqual(roster.hp[0], 3)
+        view.level_up()
+        self.assertTrue(view.ready_to_evolve())
+        evolved = view.evolve()
+        self.assertIs(evolved, view)
+        self.assertEqual(view.get_name(), "Infernoth")
+        self.assertEqual(view.get_hp(), Infernoth().get_max_hp() - (real.get_max_hp() - 3))
+
+        other = roster.spawn(Infernox)
+        view.attack(other)
+        self.assertLess(other.get_hp(), other.get_max_hp())
+        other.set_hp(0)
+        self.assertFalse(other.alive())
+        roster.regenerate()
+        self.assertEqual(other.get_hp(), other.get_max_hp())
+        self.assertRaises(ValueError, lambda: roster.class_id_of(int))
+
+    @number("1.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_battle_matches_objects(self):
+        for seed in range(10):
+            RandomGen.set_seed(seed)
+            team1 = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
+            team2 = MonsterTeam(MonsterTeam.TeamMode.FRONT, MonsterTeam.SelectionMode.RANDOM)
+            roster = MonsterRoster(simple_mode=True)
+            view_teams = []
+            for team in (team1, team2):
+                classes = [type(team.team[i]) for i in range(len(team.team))]
+                if team.team_mode == MonsterTeam.TeamMode.FRONT:
+                    classes.reverse()
+                views = ArrayR.from_list([roster.spawn(cls) for cls in classes])
+                view_teams.append(MonsterTeam(team.team_mode, MonsterTeam.SelectionMode.PROVIDED, provided_monsters=views))
+
+            self.assertEqual(
+                Battle(verbosity=0).battle(team1, team2),
+                Battle(verbosity=0).battle(view_teams[0], view_teams[1]),
+            )
+            for team, view_team in zip((team1, team2), view_teams):
+                self.assertEqual(str(team.team), str(view_team.team))
+                view_team.regenerate_team()
+                for i in range(len(view_team.team)):
+                    self.assertEqual(view_team.team[i].get_hp(), view_team.team[i].get_max_hp())
+        self.assertLess(roster.nbytes() / len(roster), 16)
+
+    @number("1.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout(30)
+    def test_teams_do_not_import_roster(self):
+        # Teams recognise roster views by their roster attribute, without importing roster.
+        subprocess.run([sys.executable, "-c", (
+            "import sys\n"
+            "from team import MonsterTeam\n"
+            "team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)\n"
+            "team.regenerate_team()\n"
+            "assert 'roster' not in sys.modules and 'numpy' not in sys.modules\n"
+        )], check=True)
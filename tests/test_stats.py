@@ -3,7 +3,7 @@ from unittest import TestCase
 from ed_utils.decorators import number, visibility
 from ed_utils.timeout import timeout
 
-from stats import SimpleStats, ComplexStats
+from stats import SimpleStats, ComplexStats, LevelCache
 
 from data_structures.referential_array import ArrayR
 
@@ -59,3 +59,62 @@ class TestStats(TestCase):
         self.assertEqual(cs.get_defense(1), 8)
         self.assertEqual(cs.get_speed(5), 250)
         self.assertEqual(cs.get_max_hp(41), 6)
+
+    @number("4.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_compiled_formulas(self):
+        cs = ComplexStats(
+            ArrayR.from_list(["level", "2", "/"]),
+            ArrayR.from_list(["7"]),
+            ArrayR.from_list(["2", "3", "power", "level", "-"]),
+            ArrayR.from_list(["level", "5", "-", "sqrt", "1", "10", "middle"]),
+        )
+        self.assertEqual(cs.get_attack(3), 1.5)
+        self.assertEqual(cs.get_defense(3), 7)
+        self.assertEqual(cs.get_speed(3), 5)
+        self.assertEqual(cs.get_max_hp(9), 2)
+        self.assertEqual(cs.get_max_hp(30), 5)
+        self.assertEqual(cs.get_max_hp(500), 10)
+        # Malformed formulas are rejected up front.
+        self.assertRaises(ValueError, lambda: ComplexStats(
+            ArrayR.from_list(["1", "+"]), ArrayR.from_list(["1"]), ArrayR.from_list(["1"]), ArrayR.from_list(["1"]),
+        ))
+        self.assertRaises(ValueError, lambda: ComplexStats(
+            ArrayR.from_list(["1", "2"]), ArrayR.from_list(["1"]), ArrayR.from_list(["1"]), ArrayR.from_list(["1"]),
+        ))
+        self.assertRaises(ValueError, lambda: ComplexStats(
+            ArrayR.from_list(["1", "2", "max"]), ArrayR.from_list(["1"]), ArrayR.from_list(["1"]), ArrayR.from_list(["1"]),
+        ))
+
+    @number("4.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_level_cache(self):
+        cs = ComplexStats(
+            ArrayR.from_list(["level", "2", "*", "1", "+"]),
+            ArrayR.from_list(["level"]),
+            ArrayR.from_list(["3"]),
+            ArrayR.from_list(["level", "10", "+"]),
+        )
+        for _ in range(3):
+            self.assertEqual(cs.get_attack(1), 3)
+            self.assertEqual(cs.get_speed(1), 3)
+        self.assertEqual(cs.get_attack(2), 5)
+        self.assertEqual((cs.attack_cache.hits, cs.attack_cache.misses), (2, 2))
+        # Constants, level itself and one-operation formulas are not worth caching.
+        self.assertIsNone(cs.defense_cache)
+        self.assertIsNone(cs.speed_cache)
+        self.assertIsNone(cs.max_hp_cache)
+        self.assertEqual(cs.get_max_hp(5), 15)
+
+        cache = LevelCache(2)
+        cache.get(1, lambda level: level)
+        cache.get(2, lambda level: level)
+        cache.get(1, lambda level: level)
+        # 2 is the least recently used, so it is evicted.
+        cache.get(3, lambda level: level)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(1, lambda level: -1), 1)
+        self.assertEqual(cache.get(2, lambda level: -2), -2)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
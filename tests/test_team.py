@@ -260,3 +260,20 @@ class TestTeam(TestCase):
 
         self.assertEqual(len(team), 1)
         self.assertIsInstance(team.retrieve_from_team(), Flamikin)
+
+    @number("3.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_provided_team_limit(self):
+        for team_mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK):
+            self.assertRaises(ValueError, lambda: MonsterTeam(
+                team_mode=team_mode,
+                selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                provided_monsters=ArrayR.from_list([Flamikin] * (MonsterTeam.TEAM_LIMIT + 1)),
+            ))
+            team = MonsterTeam(
+                team_mode=team_mode,
+                selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                provided_monsters=ArrayR.from_list([Flamikin] * MonsterTeam.TEAM_LIMIT),
+            )
+            self.assertEqual(len(team), MonsterTeam.TEAM_LIMIT)
@@ -7,7 +7,7 @@ from random_gen import RandomGen
 from battle import Battle
 from elements import Element
 from team import MonsterTeam
-from tower import BattleTower, tournament_balanced
+from tower import BattleTower, BattleRecord, tournament_balanced, run_towers, simulate_tower
 from helpers import Flamikin, Faeboa
 
 from data_structures.referential_array import ArrayR
@@ -226,6 +226,136 @@ class TestTower(TestCase):
 
         self.assertListEqual(got, expected)
 
+    @number("5.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout(30)
+    def test_parallel_towers(self):
+        seeds = [1, 2, 3, 123456789, 5, 6]
+        serial = run_towers(seeds, 3, max_workers=0)
+        self.assertListEqual([s.seed for s in serial.summaries], seeds)
+        for workers in (1, 3):
+            parallel = run_towers(seeds, 3, max_workers=workers)
+            self.assertListEqual(
+                [s.as_tuple() for s in parallel.summaries],
+                [s.as_tuple() for s in serial.summaries],
+            )
+        self.assertEqual(serial.battles, sum(s.battles for s in serial.summaries))
+        # A tower only depends on its own seed, not on what ran before it.
+        self.assertEqual(simulate_tower(5, 3).as_tuple(), serial.summaries[4].as_tuple())
+
+    @number("5.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout(30)
+    def test_towers_with_player_monsters(self):
+        RandomGen.set_seed(55)
+        expected_next = RandomGen(55).random()
+        summary = simulate_tower(1, 3, [Flamikin, Faeboa])
+        self.assertEqual(summary.seed, 1)
+        self.assertGreater(summary.battles, 0)
+        self.assertEqual(summary.battles, summary.wins + summary.losses + summary.draws)
+        self.assertEqual(simulate_tower(1, 3, [Flamikin, Faeboa]).as_tuple(), summary.as_tuple())
+        report = run_towers([1, 2], 3, [Flamikin, Faeboa], max_workers=0)
+        self.assertEqual(report.summaries[0].as_tuple(), summary.as_tuple())
+        # The towers drew from their own generators, not the shared one.
+        self.assertEqual(RandomGen.random(), expected_next)
+
+    @number("5.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_bulk_generation(self):
+        RandomGen.set_seed(2024)
+        expected = []
+        for _ in range(30):
+            team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
+            expected.append((str(team.team), RandomGen.randint(BattleTower.MIN_LIVES, BattleTower.MAX_LIVES)))
+        after = RandomGen.random()
+
+        RandomGen.set_seed(2024)
+        streamed = BattleTower.iter_teams(30)
+        first_team, first_lives = next(streamed)
+        self.assertEqual((str(first_team.team), first_lives), expected[0])
+        got = [(str(team.team), lives) for team, lives in streamed]
+        self.assertListEqual(got, expected[1:])
+        self.assertEqual(RandomGen.random(), after)
+
+        RandomGen.set_seed(2024)
+        tower = BattleTower()
+        tower.generate_teams(30)
+        self.assertEqual(str(tower.tower_teams.serve().team), expected[0][0])
+        self.assertEqual(tower.tower_lives.serve(), expected[0][1])
+
+    @number("5.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_stream(self):
+        def make_tower():
+            RandomGen.set_seed(77)
+            tower = BattleTower(Battle(verbosity=0))
+            tower.set_my_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM))
+            tower.generate_teams(5)
+            return tower
+
+        expected = [(result, player_lives, enemy_lives) for result, _, _, player_lives, enemy_lives in make_tower()]
+        records = list(make_tower().stream())
+        self.assertListEqual([(r.result, r.player_lives, r.enemy_lives) for r in records], expected)
+        self.assertIsInstance(records[0], BattleRecord)
+        self.assertListEqual([r.battle for r in records], list(range(len(records))))
+        self.assertTrue(all(1 <= r.enemy_team_id <= 5 and r.turns > 0 for r in records))
+        self.assertEqual(records[0].enemy_team_id, 1)
+        self.assertRaises(AttributeError, lambda: setattr(records[0], "turns", 0))
+
+        # Through a bounded queue and a background thread: same records.
+        self.assertListEqual(list(make_tower().stream(maxsize=2)), records)
+        # Stopping early stops the producer.
+        stream = make_tower().stream(maxsize=1)
+        self.assertEqual(next(stream), records[0])
+        stream.close()
+
+    @number("5.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_live_team_count(self):
+        RandomGen.set_seed(31)
+        tower = BattleTower(Battle(verbosity=0))
+        tower.set_my_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM))
+        tower.generate_teams(8)
+        self.assertEqual(tower.live_teams, 8)
+        for result, _, _, player_lives, enemy_lives in tower:
+            self.assertEqual(tower.live_teams, tower.tower_lives.get_length())
+        self.assertTrue(tower.player_lives == 0 or tower.live_teams == 0)
+        self.assertFalse(tower.battles_remaining())
+
+    @number("5.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_add_team(self):
+        RandomGen.set_seed(8)
+        tower = BattleTower(Battle(verbosity=0))
+        tower.set_my_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM))
+        # Enough lives that the player is never knocked out before the challenger.
+        tower.player_lives = 100
+        self.assertFalse(tower.battles_remaining())
+        for _ in range(3):
+            tower.add_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM))
+        self.assertEqual(tower.live_teams, 3)
+        for lives in (0, -1):
+            self.assertRaises(ValueError, lambda: tower.add_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM), lives=lives))
+        self.assertEqual((tower.live_teams, tower.team_count), (3, 3))
+
+        stream = tower.stream()
+        first = next(stream)
+        self.assertEqual(first.enemy_team_id, 1)
+        # A challenger arriving mid-run fights after the teams already waiting.
+        challenger = tower.add_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM), lives=1)
+        self.assertEqual(challenger, 4)
+        ids = [record.enemy_team_id for record in stream]
+        self.assertEqual(ids.count(4), 1)
+        self.assertEqual(ids[:2], [2, 3])
+        # Team 1 went back in the queue before the challenger arrived, if it had lives left.
+        self.assertEqual(ids.index(4), 3 if first.enemy_lives > 0 else 2)
+        # Every team still queued has lives left and is counted.
+        self.assertEqual(tower.live_teams, len(tower.tower_teams))
+
     @number("5.5")
     @visibility(visibility.VISIBILITY_SHOW)
     @advanced()
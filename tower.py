@@ -1,5 +1,13 @@
 from __future__ import annotations
 
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+from helpers import get_spawnable_monsters
+from monster_base import MonsterBase
 from random_gen import RandomGen
 from team import MonsterTeam
 from battle import Battle
@@ -8,19 +16,55 @@ from elements import Element
 
 from data_structures.referential_array import ArrayR
 from data_structures.abstract_list import MonsterList
-from data_structures.queue_adt import CircularMonsterQueue
+from data_structures.queue_adt import GrowableMonsterQueue
 from data_structures.bset import BSet
 
+class BattleRecord(NamedTuple):
+    """
+    Outcome of one tower battle. Holds no teams, so records are cheap to keep or queue.
+
+    Attributes:
+        battle (int): index of the battle in the tower, from 0
+        result (Battle.Result): TEAM1 is the player, TEAM2 the enemy
+        player_team_id (int): always BattleTower.PLAYER_TEAM_ID
+        enemy_team_id (int): id the enemy team was given when it entered the tower
+        player_lives (int): player lives after the battle
+        enemy_lives (int): enemy team lives after the battle
+        turns (int): turns the battle took
+    """
+    battle: int
+    result: Battle.Result
+    player_team_id: int
+    enemy_team_id: int
+    player_lives: int
+    enemy_lives: int
+    turns: int
+
+
 class BattleTower:
 
     MIN_LIVES = 2
     MAX_LIVES = 10
+    # Enemy teams are numbered from 1 in the order they enter the tower.
+    PLAYER_TEAM_ID = 0
 
 
 
-    def __init__(self, battle: Battle|None=None) -> None:
+    def __init__(self, battle: Battle|None=None, rng=RandomGen) -> None:
+        """
+        :param rng: where the tower draws teams and lives from; the shared RandomGen
+            by default, or a RandomGen instance to keep the tower's randomness separate.
+        """
         self.battle = battle or Battle(verbosity=0)
+        self.rng = rng
         self.battle_count = 0
+        self.team_count = 0
+        # Enemy teams in the tower with lives left, kept up to date by generate_teams and _fight.
+        self.live_teams = 0
+        # Enemy teams, their lives and ids, in battle order. They grow as teams are added.
+        self.tower_teams = GrowableMonsterQueue()
+        self.tower_lives = GrowableMonsterQueue()
+        self.tower_ids = GrowableMonsterQueue()
         self.dead_teams = MonsterList()
         self.seen_elements = BSet()
 
@@ -42,27 +86,71 @@ class BattleTower:
         self.player_lives = self.MAX_LIVES
 
     def generate_teams(self, n: int) -> None:
-        
-        enemy_list = CircularMonsterQueue(n)
-        enemy_lives = CircularMonsterQueue(n)
-
-        for i in range(n):
-            new_team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
-            enemy_lives.append(RandomGen.randint(self.MIN_LIVES, self.MAX_LIVES))
-            enemy_list.append(new_team)
-        self.tower_teams = enemy_list
-        self.tower_lives = enemy_lives
-        
+        """
+        Fills the tower with n random enemy teams and their lives.
+        Same RandomGen sequence as making each team with MonsterTeam(BACK, RANDOM)
+        and then drawing its lives.
+
+        Complexity: O(n*t) where t is the team size limit
+        """
+        self.tower_teams = GrowableMonsterQueue(n)
+        self.tower_lives = GrowableMonsterQueue(n)
+        self.tower_ids = GrowableMonsterQueue(n)
+        self.live_teams = 0
+
+        for team, lives in self.iter_teams(n, self.rng):
+            self.add_team(team, lives)
+
+    def add_team(self, team: MonsterTeam, lives: Optional[int] = None) -> int:
+        """
+        Adds an enemy team to the back of the tower. Teams can be added at any time,
+        including between battles of a running tower, and fight after the teams already in it.
+        lives defaults to a random number from MIN_LIVES to MAX_LIVES.
+
+        :returns: the id given to the team
+        :raises ValueError: if lives is less than 1
+        Complexity: O(1) amortized
+        """
+        if lives is None:
+            lives = self.rng.randint(self.MIN_LIVES, self.MAX_LIVES)
+        elif lives < 1:
+            raise ValueError(f"A team needs at least 1 life to enter the tower, got {lives}")
+        self.team_count += 1
+        self.tower_teams.append(team)
+        self.tower_lives.append(lives)
+        self.tower_ids.append(self.team_count)
+        self.live_teams += 1
+        return self.team_count
+
+    @classmethod
+    def iter_teams(cls, n: int, rng=RandomGen) -> Iterator[tuple[MonsterTeam, int]]:
+        """
+        Yields n (random BACK team, lives) pairs, one at a time, drawing from rng
+        (the shared RandomGen by default) in the same order as generate_teams. Monsters are picked straight from the
+        precomputed spawnable tuple and teams are built with MonsterTeam.from_monsters.
+
+        Complexity: O(t) per team where t is the team size limit
+        """
+        spawnable = get_spawnable_monsters()
+        if len(spawnable) == 0:
+            raise ValueError("Spawning logic failed.")
+        last = len(spawnable) - 1
+        team_limit = MonsterTeam.TEAM_LIMIT
+        back = MonsterTeam.TeamMode.BACK
+        randint = rng.randint
+        for _ in range(n):
+            # Team size, then one pick per slot, as MonsterTeam.select_randomly does.
+            team_size = randint(1, team_limit)
+            monsters = [spawnable[randint(0, last)]() for _ in range(team_size)]
+            yield MonsterTeam.from_monsters(back, monsters), randint(cls.MIN_LIVES, cls.MAX_LIVES)
+
     def battles_remaining(self) -> bool:
         """returns true if battles are remaining because no one is dead yet.
-            runs in O(n^2)
+            runs in O(1), using the count of enemy teams with lives left
         """
         if self.player_lives == 0:
             return False
-        for i in range(self.tower_lives.get_length()):
-            if self.tower_lives.export()[i] > 0:
-                return True
-        return False
+        return self.live_teams > 0
 
     def next_battle(self) -> tuple[Battle.Result, MonsterTeam, MonsterTeam, int, int]:
         """
@@ -87,18 +175,52 @@ class BattleTower:
         main complexity inherited from Battle.battle,
         so ill call it O(b)
         """
+        record, enemy_team = self._fight()
+        #add enemy to dead teams list, not really useful but good to keep
+        if record.enemy_lives == 0:
+            self.dead_teams.append(enemy_team)
+        #results are recorded for return (results, player_team, enemy_team, player lives, enemy lives)
+        return (record.result, self.player_team, enemy_team, record.player_lives, record.enemy_lives)
+
+    def stream(self, maxsize: int = 0) -> Iterator[BattleRecord]:
+        """
+        Fights the remaining battles, yielding a BattleRecord for each.
+
+        Unlike iterating over the tower, defeated teams are dropped instead of kept in
+        dead_teams and no teams are handed out, so memory stays flat however many battles run.
 
+        If maxsize > 0 the battles run in a background thread, which waits whenever maxsize
+        records are queued and not yet consumed. The tower must not be used by anything
+        else until the stream is exhausted or closed.
+
+        complexity is O(b) per battle, as in next_battle
+        """
+        if maxsize > 0:
+            return _queued(self._records(), maxsize)
+        return self._records()
+
+    def _records(self) -> Iterator[BattleRecord]:
+        while self.battles_remaining():
+            yield self._fight()[0]
+
+    def _fight(self) -> tuple[BattleRecord, MonsterTeam]:
+        """
+        Fights the next battle (see next_battle) and puts the enemy team back
+        in the tower if it has lives left.
+        :returns: the battle's record and the enemy team
+        """
         #lives and team served from team tower
         enemy_team = self.tower_teams.serve()
         enemy_lives = self.tower_lives.serve()
+        enemy_id = self.tower_ids.serve()
 
         #elements in upcoming battler are collected
         battle_set = BSet()
         monsters = enemy_team.team
         for i in range(len(monsters)):
-            battle_set.add(Element.from_string(monsters[i].get_element()).value)
+            battle_set.add(monsters[i].get_element_type().value)
         for i in range(len(self.player_team.team)):
-            battle_set.add(Element.from_string(self.player_team.team[i].get_element()).value)
+            battle_set.add(self.player_team.team[i].get_element_type().value)
         #both teams are regenerated
         self.player_team.regenerate_team()
         enemy_team.regenerate_team()
@@ -119,24 +241,27 @@ class BattleTower:
         #otherwise enemy won and player loses a life
         else:
             self.player_lives -= 1
-        #results are recorded for return (results, player_team, enemy_team, player lives, enemy lives)
-        results = (battle_result, self.player_team, enemy_team, self.player_lives, enemy_lives)
-        #add enemy to dead teams list, not really useful but good to keep
+
+        record = BattleRecord(
+            self.battle_count, battle_result, self.PLAYER_TEAM_ID, enemy_id,
+            self.player_lives, enemy_lives, self.battle.turn_number,
+        )
+        self.battle_count += 1
         if enemy_lives == 0:
-            self.dead_teams.append(enemy_team)
-        else:
+            self.live_teams -= 1
+        if enemy_lives > 0:
             self.tower_teams.append(enemy_team)
             self.tower_lives.append(enemy_lives)
-
-        return results   
+            self.tower_ids.append(enemy_id)
+        return record, enemy_team
 
     def out_of_meta(self) -> ArrayR[Element]:
             next_battle_set = BSet()
             next_enemy = self.tower_teams.peek()
             for i in range(len(self.player_team.team)):
-                next_battle_set.add(Element.from_string(self.player_team.team[i].get_element()).value)
+                next_battle_set.add(self.player_team.team[i].get_element_type().value)
             for i in range(len(next_enemy.team)):
-                next_battle_set.add(Element.from_string(next_enemy.team[i].get_element()).value)
+                next_battle_set.add(next_enemy.team[i].get_element_type().value)
             values = self.seen_elements.difference(next_battle_set)
 
             final = MonsterList()
@@ -157,6 +282,170 @@ def tournament_balanced(tournament_array: ArrayR[str]):
     # 1054 ONLY
     raise NotImplementedError
 
+
+class _Failure:
+    """Carries an exception from the producer thread of _queued to the consumer."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_END = object()
+
+
+def _queued(records: Iterator[BattleRecord], maxsize: int) -> Iterator[BattleRecord]:
+    """
+    Produces `records` in a background thread through a bounded queue, yielding them in order.
+    Exceptions in the producer are re-raised here. Closing this generator early stops the
+    producer after the battle it is fighting.
+    """
+    buffer = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for record in records:
+                buffer.put(record)
+                if stop.is_set():
+                    return
+            buffer.put(_END)
+        except BaseException as error:
+            buffer.put(_Failure(error))
+
+    producer = threading.Thread(target=produce, name="tower-stream", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        # Keep taking items so a producer blocked on a full queue can see stop and exit.
+        while producer.is_alive():
+            try:
+                buffer.get(timeout=0.05)
+            except queue.Empty:
+                pass
+
+
+class TowerSummary:
+    """
+    Outcome of running one tower to completion.
+
+    Attributes:
+        seed (int): the RandomGen seed the tower was run with
+        battles (int): number of battles fought
+        wins, losses, draws (int): battle results from the player's point of view
+        player_lives (int): lives the player had left at the end
+        teams_defeated (int): enemy teams knocked out of the tower
+    """
+
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+        self.battles = 0
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+        self.player_lives = 0
+        self.teams_defeated = 0
+
+    def add(self, record: BattleRecord) -> None:
+        """Counts one battle. player_lives becomes the lives after it."""
+        self.battles += 1
+        if record.result == Battle.Result.TEAM1:
+            self.wins += 1
+        elif record.result == Battle.Result.TEAM2:
+            self.losses += 1
+        else:
+            self.draws += 1
+        if record.enemy_lives == 0:
+            self.teams_defeated += 1
+        self.player_lives = record.player_lives
+
+    def cleared(self) -> bool:
+        """Whether the player beat every team in the tower."""
+        return self.player_lives > 0
+
+    def as_tuple(self) -> tuple[int, int, int, int, int, int, int]:
+        return (self.seed, self.battles, self.wins, self.losses, self.draws, self.player_lives, self.teams_defeated)
+
+    def __str__(self) -> str:
+        return (f"seed {self.seed}: {self.battles} battles (W{self.wins}/L{self.losses}/D{self.draws}), "
+                f"{self.player_lives} lives left, {self.teams_defeated} teams defeated")
+
+
+class TowerReport:
+    """
+    Aggregate of many TowerSummary results, in the order their seeds were given.
+    """
+
+    def __init__(self, summaries: Sequence[TowerSummary]) -> None:
+        self.summaries = summaries
+        self.towers = len(summaries)
+        self.battles = sum(s.battles for s in summaries)
+        self.wins = sum(s.wins for s in summaries)
+        self.losses = sum(s.losses for s in summaries)
+        self.draws = sum(s.draws for s in summaries)
+        self.cleared = sum(1 for s in summaries if s.cleared())
+
+    def __str__(self) -> str:
+        if self.towers == 0:
+            return "0 towers"
+        return (f"{self.towers} towers, {self.cleared} cleared ({self.cleared / self.towers:.1%})\n"
+                f"{self.battles} battles, {self.battles / self.towers:.1f} per tower\n"
+                f"W{self.wins}/L{self.losses}/D{self.draws}, win rate {self.wins / max(1, self.battles):.1%}")
+
+
+def simulate_tower(seed: int, n_teams: int, player_monsters: Optional[Sequence[type[MonsterBase]]]=None) -> TowerSummary:
+    """
+    Runs a whole tower from a fresh seed.
+
+    The player team is one new monster of each class in `player_monsters` (in TeamMode.BACK)
+    if given, otherwise drawn at random. Everything random is drawn from a RandomGen(seed) of
+    its own, so the result depends only on the arguments, not on which process runs it or
+    what ran before, and the shared RandomGen is left alone.
+
+    complexity is O(b) per battle fought, as in next_battle
+    """
+    rng = RandomGen(seed)
+    if player_monsters is None:
+        player_team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM, rng=rng)
+    else:
+        player_team = MonsterTeam.from_monsters(MonsterTeam.TeamMode.BACK, [monster() for monster in player_monsters])
+    bt = BattleTower(Battle(verbosity=0), rng=rng)
+    bt.set_my_team(player_team)
+    bt.generate_teams(n_teams)
+
+    summary = TowerSummary(seed)
+    for record in bt.stream():
+        summary.add(record)
+    summary.player_lives = bt.player_lives
+    return summary
+
+
+def run_towers(seeds: Sequence[int], n_teams: int, player_monsters: Optional[Sequence[type[MonsterBase]]]=None, max_workers: Optional[int]=None) -> TowerReport:
+    """
+    Runs one independent tower per seed across a process pool and aggregates the results.
+
+    Each tower seeds its own RandomGen (see simulate_tower), so the report is identical for
+    any `max_workers`. max_workers=None uses one process per CPU; max_workers=0 runs
+    everything in this process.
+    """
+    seeds = list(seeds)
+    n = len(seeds)
+    if max_workers == 0:
+        return TowerReport([simulate_tower(seed, n_teams, player_monsters) for seed in seeds])
+    workers = max_workers or os.cpu_count() or 1
+    # A few chunks per worker keeps the pool busy without paying per-tower IPC.
+    chunksize = max(1, n // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = list(pool.map(simulate_tower, seeds, [n_teams] * n, [player_monsters] * n, chunksize=chunksize))
+    return TowerReport(summaries)
+
 if __name__ == "__main__":
 
     RandomGen.set_seed(129371)